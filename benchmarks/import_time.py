@@ -0,0 +1,69 @@
+"""Benchmark cold import time of the mimosa package and its submodules.
+
+Each import runs in a fresh interpreter so module caches do not leak between
+runs. Usage: ``uv run python benchmarks/import_time.py [--repeat N]``.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = [
+    "import mimosa",
+    "import mimosa.composite",
+    "from mimosa import calculate_ndvi",
+    "import mimosa.data",
+    "from mimosa import load_band",
+]
+
+
+def time_import(statement: str, repeat: int) -> list[float]:
+    """Time a statement in fresh interpreters.
+
+    Parameters
+    ----------
+    statement : str
+        Import statement to execute.
+    repeat : int
+        Number of interpreter launches.
+
+    Returns
+    -------
+    list[float]
+        Import durations in milliseconds, excluding interpreter start-up.
+
+    """
+    code = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "print((time.perf_counter() - start) * 1000)\n"
+    )
+    durations = []
+    for _ in range(repeat):
+        result = subprocess.run(  # noqa: S603
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        durations.append(float(result.stdout))
+    return durations
+
+
+def main() -> None:
+    """Print the median and minimum import time of each statement."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    width = max(len(statement) for statement in STATEMENTS)
+    print(f"{'statement':<{width}}  {'median ms':>10}  {'min ms':>10}")
+    for statement in STATEMENTS:
+        durations = time_import(statement, args.repeat)
+        print(
+            f"{statement:<{width}}  {statistics.median(durations):>10.1f}  "
+            f"{min(durations):>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
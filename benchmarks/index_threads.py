@@ -0,0 +1,91 @@
+"""Benchmark index and composite kernels across thread counts.
+
+Runs on a synthetic scene so no data files are needed. Usage:
+``uv run python benchmarks/index_threads.py [--size H W] [--repeat N]``.
+"""
+
+import argparse
+import os
+import time
+from collections.abc import Callable
+
+import numpy as np
+
+from mimosa.composite import (
+    calculate_ndvi,
+    create_rgb_composite,
+    get_percentile_range,
+    normalize_band,
+)
+from mimosa.parallel import set_num_threads
+
+
+def best_time(func: Callable[[], object], repeat: int) -> float:
+    """Get the best wall time of a callable in milliseconds.
+
+    Parameters
+    ----------
+    func : Callable[[], object]
+        Callable to time.
+    repeat : int
+        Number of timed runs.
+
+    Returns
+    -------
+    float
+        Minimum duration in milliseconds.
+
+    """
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - start) * 1000)
+    return min(durations)
+
+
+def main() -> None:
+    """Print kernel timings and speed-up for increasing thread counts."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, nargs=2, default=(4096, 4096))
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    shape = tuple(args.size)
+    bands = {
+        band_id: rng.random(shape, dtype=np.float32)
+        for band_id in ("B02", "B03", "B04", "B08")
+    }
+    masks = {band_id: np.full(shape, 255, dtype=np.uint8) for band_id in bands}
+    kernels = {
+        "calculate_ndvi": lambda: calculate_ndvi(bands, masks),
+        "get_percentile_range": lambda: get_percentile_range(
+            bands["B04"], masks["B04"]
+        ),
+        "normalize_band": lambda: normalize_band(bands["B04"], masks["B04"]),
+        "create_rgb_composite": lambda: create_rgb_composite(
+            bands, masks, "B04", "B03", "B02"
+        ),
+    }
+
+    thread_counts = [1]
+    while thread_counts[-1] * 2 <= (os.process_cpu_count() or 1):
+        thread_counts.append(thread_counts[-1] * 2)
+
+    print(f"{'kernel':<22} {'threads':>7} {'ms':>9} {'speed-up':>9}")
+    for name, kernel in kernels.items():
+        baseline = None
+        for num_threads in thread_counts:
+            set_num_threads(num_threads)
+            duration = best_time(kernel, args.repeat)
+            baseline = baseline or duration
+            print(
+                f"{name:<22} {num_threads:>7} {duration:>9.1f} "
+                f"{baseline / duration:>8.2f}x"
+            )
+    set_num_threads(None)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,42 +1,243 @@
-"""Mimosa bloom detection using Sentinel-2 satellite imagery."""
-
-from mimosa.composite import (
-    COMPOSITE_PRESETS,
-    INDEX_LAYERS,
-    calculate_moisture_index,
-    calculate_ndsi,
-    calculate_ndvi,
-    calculate_ndwi,
-    create_index_visualization,
-    create_rgb_composite,
-    get_composite_preset,
-    normalize_band,
-)
-from mimosa.constants import SENTINEL2_BANDS, get_band_label
-from mimosa.data import (
-    discover_dates,
-    get_date_directory,
-    load_all_bands,
-    load_band,
-    load_true_color,
-)
-
-__all__ = [
-    "COMPOSITE_PRESETS",
-    "INDEX_LAYERS",
-    "SENTINEL2_BANDS",
-    "calculate_moisture_index",
-    "calculate_ndsi",
-    "calculate_ndvi",
-    "calculate_ndwi",
-    "create_index_visualization",
-    "create_rgb_composite",
-    "discover_dates",
-    "get_band_label",
-    "get_composite_preset",
-    "get_date_directory",
-    "load_all_bands",
-    "load_band",
-    "load_true_color",
-    "normalize_band",
-]
+"""Mimosa bloom detection using Sentinel-2 satellite imagery.
+
+The public API is exposed lazily: submodules are only imported on first
+attribute access, so pure NumPy modules such as `mimosa.composite` can be used
+without loading rasterio/GDAL.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from mimosa.cache import (
+        DEFAULT_CACHE_BYTES,
+        CacheEntry,
+        ProductCache,
+        compute_index_visualization,
+        compute_product,
+        get_default_cache,
+        get_product_key,
+    )
+    from mimosa.composite import (
+        COMPOSITE_PRESETS,
+        INDEX_LAYERS,
+        PERCENTILE_BINS,
+        calculate_moisture_index,
+        calculate_ndsi,
+        calculate_ndvi,
+        calculate_ndwi,
+        create_index_visualization,
+        create_rgb_composite,
+        get_composite_preset,
+        get_percentile_range,
+        normalize_band,
+    )
+    from mimosa.constants import (
+        SENTINEL2_BANDS,
+        get_band_label,
+    )
+    from mimosa.data import (
+        discover_dates,
+        get_band_path,
+        get_date_directory,
+        load_all_bands,
+        load_band,
+        load_band_profile,
+        load_true_color,
+    )
+    from mimosa.export import (
+        GEOTIFF_BLOCKSIZE,
+        GEOTIFF_COMPRESSIONS,
+        get_overview_factors,
+        open_geotiff,
+        write_geotiff,
+    )
+    from mimosa.mosaic import (
+        MOSAIC_CHUNK_ROWS,
+        create_temporal_mosaic,
+    )
+    from mimosa.parallel import (
+        PARALLEL_BLOCK_PIXELS,
+        PARALLEL_MIN_PIXELS,
+        get_num_threads,
+        get_row_blocks,
+        run_row_blocks,
+        run_tasks,
+        set_num_threads,
+    )
+    from mimosa.phenology import (
+        DAYS_PER_YEAR,
+        PHENOLOGY_CHUNK_PIXELS,
+        PHENOLOGY_HARMONICS,
+        fit_phenology,
+        get_day_of_year,
+        get_harmonic_design,
+    )
+    from mimosa.quicklook import (
+        QUICKLOOK_CACHE_ENTRIES,
+        QUICKLOOK_LEVELS,
+        build_quicklook_pyramid,
+        clear_quicklook_cache,
+        load_quicklook,
+    )
+    from mimosa.reproject import (
+        REPROJECT_METHODS,
+        WarpMap,
+        clear_warp_cache,
+        get_target_grid,
+        get_warp_map,
+        reproject_array,
+        reproject_scene,
+    )
+    from mimosa.shared import (
+        SharedArrayHandle,
+        SharedSceneHandle,
+        attach_array,
+        attach_scene,
+        share_array,
+        share_scene,
+    )
+    from mimosa.sparse import (
+        SparseIndex,
+        compress_scene,
+        expand,
+    )
+    from mimosa.spectral import (
+        SPECTRAL_CHUNK_PIXELS,
+        SPECTRAL_METHODS,
+        SPECTRAL_SIGNATURES,
+        compute_spectral_scores,
+    )
+    from mimosa.zonal import (
+        clear_zone_cache,
+        compute_zonal_stats,
+        rasterize_zones,
+    )
+
+# Submodule providing each public name
+_LAZY_IMPORTS: dict[str, list[str]] = {
+    "mimosa.cache": [
+        "DEFAULT_CACHE_BYTES",
+        "CacheEntry",
+        "ProductCache",
+        "compute_index_visualization",
+        "compute_product",
+        "get_default_cache",
+        "get_product_key",
+    ],
+    "mimosa.composite": [
+        "COMPOSITE_PRESETS",
+        "INDEX_LAYERS",
+        "PERCENTILE_BINS",
+        "calculate_moisture_index",
+        "calculate_ndsi",
+        "calculate_ndvi",
+        "calculate_ndwi",
+        "create_index_visualization",
+        "create_rgb_composite",
+        "get_composite_preset",
+        "get_percentile_range",
+        "normalize_band",
+    ],
+    "mimosa.constants": [
+        "SENTINEL2_BANDS",
+        "get_band_label",
+    ],
+    "mimosa.data": [
+        "discover_dates",
+        "get_band_path",
+        "get_date_directory",
+        "load_all_bands",
+        "load_band",
+        "load_band_profile",
+        "load_true_color",
+    ],
+    "mimosa.export": [
+        "GEOTIFF_BLOCKSIZE",
+        "GEOTIFF_COMPRESSIONS",
+        "get_overview_factors",
+        "open_geotiff",
+        "write_geotiff",
+    ],
+    "mimosa.mosaic": [
+        "MOSAIC_CHUNK_ROWS",
+        "create_temporal_mosaic",
+    ],
+    "mimosa.parallel": [
+        "PARALLEL_BLOCK_PIXELS",
+        "PARALLEL_MIN_PIXELS",
+        "get_num_threads",
+        "get_row_blocks",
+        "run_row_blocks",
+        "run_tasks",
+        "set_num_threads",
+    ],
+    "mimosa.phenology": [
+        "DAYS_PER_YEAR",
+        "PHENOLOGY_CHUNK_PIXELS",
+        "PHENOLOGY_HARMONICS",
+        "fit_phenology",
+        "get_day_of_year",
+        "get_harmonic_design",
+    ],
+    "mimosa.quicklook": [
+        "QUICKLOOK_CACHE_ENTRIES",
+        "QUICKLOOK_LEVELS",
+        "build_quicklook_pyramid",
+        "clear_quicklook_cache",
+        "load_quicklook",
+    ],
+    "mimosa.reproject": [
+        "REPROJECT_METHODS",
+        "WarpMap",
+        "clear_warp_cache",
+        "get_target_grid",
+        "get_warp_map",
+        "reproject_array",
+        "reproject_scene",
+    ],
+    "mimosa.shared": [
+        "SharedArrayHandle",
+        "SharedSceneHandle",
+        "attach_array",
+        "attach_scene",
+        "share_array",
+        "share_scene",
+    ],
+    "mimosa.sparse": [
+        "SparseIndex",
+        "compress_scene",
+        "expand",
+    ],
+    "mimosa.spectral": [
+        "SPECTRAL_CHUNK_PIXELS",
+        "SPECTRAL_METHODS",
+        "SPECTRAL_SIGNATURES",
+        "compute_spectral_scores",
+    ],
+    "mimosa.zonal": [
+        "clear_zone_cache",
+        "compute_zonal_stats",
+        "rasterize_zones",
+    ],
+}
+_EXPORTS = {name: module for module, names in _LAZY_IMPORTS.items() for name in names}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    """Import the submodule providing a public name on first access."""
+    module = _EXPORTS.get(name)
+    if module is None:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    value = getattr(import_module(module), name)
+    # Cache on the package so later lookups bypass __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List module attributes including lazily imported public names."""
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,433 @@
+"""Content-addressed on-disk cache of derived products."""
+
+import hashlib
+import json
+import os
+import tempfile
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from mimosa.composite import create_index_visualization
+from mimosa.constants import SENTINEL2_BANDS
+from mimosa.data import get_band_path, load_all_bands
+
+# Default byte budget of a product cache
+DEFAULT_CACHE_BYTES = 2 << 30
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """Stored product of a `ProductCache`.
+
+    Attributes
+    ----------
+    key : str
+        Content hash identifying the product.
+    function : str
+        Qualified name of the function that computed the product.
+    params : str
+        JSON-encoded function parameters.
+    nbytes : int
+        Size of the stored array file in bytes.
+    last_access : datetime
+        Time of the last read or write, used for LRU eviction.
+
+    """
+
+    key: str
+    function: str
+    params: str
+    nbytes: int
+    last_access: datetime
+
+
+def _get_version() -> str:
+    """Get the installed library version, part of every cache key."""
+    try:
+        return version("mimosa")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def _encode_param(value: Any) -> Any:
+    """Encode parameters json does not handle natively."""
+    if isinstance(value, partial):
+        return {
+            "partial": _encode_param(value.func),
+            "args": value.args,
+            "keywords": value.keywords,
+        }
+    if callable(value):
+        qualname = getattr(value, "__qualname__", None)
+        # Lambdas and nested functions share names, they would share keys
+        if qualname is None or "<lambda>" in qualname or "<locals>" in qualname:
+            msg = (
+                f"Cannot use {value!r} as a cache key parameter, use a "
+                "module-level function"
+            )
+            raise TypeError(msg)
+        return f"{value.__module__}.{qualname}"
+    if isinstance(value, np.ndarray | np.generic):
+        return value.tolist()
+    if isinstance(value, Path | datetime):
+        return str(value)
+    msg = f"Cannot use {type(value).__name__} as a cache key parameter"
+    raise TypeError(msg)
+
+
+def _unwrap_partial(function: Callable[..., Any]) -> Callable[..., Any]:
+    """Get the function wrapped by nested `functools.partial` objects."""
+    while isinstance(function, partial):
+        function = function.func
+    return function
+
+
+def get_product_key(
+    input_paths: list[Path],
+    function: Callable[..., Any],
+    params: dict[str, Any],
+) -> str:
+    """Hash the inputs, function, parameters and library version of a product.
+
+    Parameters
+    ----------
+    input_paths : list[Path]
+        Input files, identified by resolved path, size and modification time.
+    function : Callable[..., Any]
+        Module-level function computing the product, possibly wrapped in
+        `functools.partial`.
+    params : dict[str, Any]
+        Function parameters, JSON-encodable or callables, arrays and paths.
+
+    Returns
+    -------
+    str
+        Hex SHA-256 digest.
+
+    Raises
+    ------
+    TypeError
+        If a parameter cannot be encoded, e.g. a lambda or nested function
+        without a stable name.
+
+    """
+    files = []
+    for path in input_paths:
+        stat = path.stat()
+        files.append([str(path.resolve()), stat.st_size, stat.st_mtime_ns])
+    payload = {
+        "files": files,
+        "function": _encode_param(function),
+        "params": params,
+        "version": _get_version(),
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=_encode_param)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class ProductCache:
+    """Directory of memory-mappable products with a byte budget.
+
+    Each product is stored as `<key>.npy` with a `<key>.json` description.
+    The modification time of the array file records its last access, and the
+    least recently used products are evicted once the budget is exceeded.
+
+    Parameters
+    ----------
+    cache_dir : Path
+        Cache directory, created if missing.
+    max_bytes : int
+        Byte budget of the stored arrays, by default DEFAULT_CACHE_BYTES.
+
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int = DEFAULT_CACHE_BYTES) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _array_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.npy"
+
+    def _info_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> NDArray[Any] | None:
+        """Get a stored product as a read-only memory map.
+
+        Parameters
+        ----------
+        key : str
+            Product key from `get_product_key`.
+
+        Returns
+        -------
+        NDArray[Any] | None
+            Memory-mapped product, or None if it is not stored.
+
+        """
+        path = self._array_path(key)
+        try:
+            array = np.load(path, mmap_mode="r")
+            # Mark as recently used
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return array
+
+    def put(
+        self,
+        key: str,
+        array: NDArray[Any],
+        function: str = "",
+        params: str = "",
+    ) -> NDArray[Any]:
+        """Store a product and evict least recently used ones over budget.
+
+        Parameters
+        ----------
+        key : str
+            Product key from `get_product_key`.
+        array : NDArray[Any]
+            Product to store.
+        function : str
+            Qualified name of the function, shown by `entries`.
+        params : str
+            JSON-encoded parameters, shown by `entries`.
+
+        Returns
+        -------
+        NDArray[Any]
+            Read-only memory map of the stored product, or the array itself
+            if it is larger than the whole budget.
+
+        """
+        if array.nbytes > self.max_bytes:
+            return array
+
+        # Write to a temporary file first so readers never see partial files
+        with tempfile.NamedTemporaryFile(
+            dir=self.cache_dir, suffix=".tmp", delete=False
+        ) as tmp:
+            np.save(tmp, np.ascontiguousarray(array))
+        self._info_path(key).write_text(
+            json.dumps({"function": function, "params": params})
+        )
+        Path(tmp.name).replace(self._array_path(key))
+
+        self.evict(keep=key)
+        return np.load(self._array_path(key), mmap_mode="r")
+
+    def entries(self) -> list[CacheEntry]:
+        """List stored products, most recently used first.
+
+        Returns
+        -------
+        list[CacheEntry]
+            Description of every stored product.
+
+        """
+        entries = []
+        for path in self.cache_dir.glob("*.npy"):
+            try:
+                stat = path.stat()
+                info = json.loads(self._info_path(path.stem).read_text())
+            except FileNotFoundError:
+                continue
+            entries.append(
+                CacheEntry(
+                    key=path.stem,
+                    function=info["function"],
+                    params=info["params"],
+                    nbytes=stat.st_size,
+                    last_access=datetime.fromtimestamp(stat.st_mtime),  # noqa: DTZ006
+                )
+            )
+        return sorted(entries, key=lambda entry: entry.last_access, reverse=True)
+
+    def total_bytes(self) -> int:
+        """Get the size of all stored products in bytes."""
+        return sum(entry.nbytes for entry in self.entries())
+
+    def remove(self, key: str) -> None:
+        """Remove a stored product, if present.
+
+        Memory maps already returned for it stay valid.
+        """
+        self._array_path(key).unlink(missing_ok=True)
+        self._info_path(key).unlink(missing_ok=True)
+
+    def evict(self, keep: str | None = None) -> None:
+        """Remove least recently used products until within the byte budget.
+
+        Parameters
+        ----------
+        keep : str | None
+            Key never evicted, e.g. the product just stored.
+
+        """
+        entries = self.entries()
+        total = sum(entry.nbytes for entry in entries)
+        for entry in reversed(entries):
+            if total <= self.max_bytes:
+                break
+            if entry.key != keep:
+                self.remove(entry.key)
+                total -= entry.nbytes
+
+    def purge(self, function: str | None = None) -> int:
+        """Remove stored products.
+
+        Parameters
+        ----------
+        function : str | None
+            Only remove products of this function (qualified name or bare
+            name, e.g. 'calculate_ndvi'), by default all.
+
+        Returns
+        -------
+        int
+            Number of removed products.
+
+        """
+        removed = 0
+        for entry in self.entries():
+            if function is None or function in {
+                entry.function,
+                entry.function.rpartition(".")[2],
+            }:
+                self.remove(entry.key)
+                removed += 1
+        return removed
+
+
+def get_default_cache() -> ProductCache:
+    """Get the product cache configured by the environment.
+
+    Returns
+    -------
+    ProductCache
+        Cache in the MIMOSA_CACHE_DIR environment variable directory, else
+        `~/.cache/mimosa`, with a MIMOSA_CACHE_BYTES budget if set.
+
+    """
+    cache_dir = os.environ.get("MIMOSA_CACHE_DIR")
+    max_bytes = os.environ.get("MIMOSA_CACHE_BYTES")
+    return ProductCache(
+        Path(cache_dir) if cache_dir else Path.home() / ".cache" / "mimosa",
+        int(max_bytes) if max_bytes else DEFAULT_CACHE_BYTES,
+    )
+
+
+def compute_product(
+    data_dir: Path,
+    date: datetime,
+    function: Callable[..., NDArray[Any]],
+    *args: Any,
+    cache: ProductCache | None = None,
+    **kwargs: Any,
+) -> NDArray[Any]:
+    """Compute a band product for a date through the product cache.
+
+    Bands are only loaded on a cache miss. The key covers every band file of
+    the date, the function, its parameters and the library version, so
+    products are recomputed when any of them changes.
+
+    Parameters
+    ----------
+    data_dir : Path
+        Root directory containing Sentinel-2 data.
+    date : datetime
+        Acquisition date.
+    function : Callable[..., NDArray[Any]]
+        Function taking (bands, masks, *args, **kwargs), e.g.
+        `calculate_ndvi` or `create_rgb_composite`.
+    *args : Any
+        Extra positional parameters, e.g. the composite bands.
+    cache : ProductCache | None
+        Cache to use, by default `get_default_cache()`.
+    **kwargs : Any
+        Extra keyword parameters, e.g. `normalize`.
+
+    Returns
+    -------
+    NDArray[Any]
+        Read-only product, memory-mapped from the cache.
+
+    Examples
+    --------
+    >>> ndvi = compute_product(DATA_DIR, date, calculate_ndvi)
+    >>> rgb = compute_product(DATA_DIR, date, create_rgb_composite,
+    ...                       **get_composite_preset("False Color"))
+
+    """
+    cache = cache or get_default_cache()
+    band_paths = [get_band_path(data_dir, date, band_id) for band_id in SENTINEL2_BANDS]
+    params = {"args": args, "kwargs": kwargs}
+    key = get_product_key(band_paths, function, params)
+
+    product = cache.get(key)
+    if product is None:
+        bands, masks = load_all_bands(data_dir, date)
+        product = cache.put(
+            key,
+            function(bands, masks, *args, **kwargs),
+            function=_encode_param(_unwrap_partial(function)),
+            params=json.dumps(params, sort_keys=True, default=_encode_param),
+        )
+    return product
+
+
+def compute_index_visualization(
+    data_dir: Path,
+    date: datetime,
+    index_function: Callable[..., NDArray[np.float32]],
+    colormap: str = "RdYlGn",
+    cache: ProductCache | None = None,
+) -> NDArray[np.uint8]:
+    """Compute an index visualization for a date through the product cache.
+
+    The index itself is also computed through the cache.
+
+    Parameters
+    ----------
+    data_dir : Path
+        Root directory containing Sentinel-2 data.
+    date : datetime
+        Acquisition date.
+    index_function : Callable[..., NDArray[np.float32]]
+        Index function taking (bands, masks), e.g. `calculate_ndvi`.
+    colormap : str
+        Colormap name, by default 'RdYlGn'.
+    cache : ProductCache | None
+        Cache to use, by default `get_default_cache()`.
+
+    Returns
+    -------
+    NDArray[np.uint8]
+        Read-only RGB image (H, W, 3), memory-mapped from the cache.
+
+    """
+    cache = cache or get_default_cache()
+    band_paths = [get_band_path(data_dir, date, band_id) for band_id in SENTINEL2_BANDS]
+    params = {"index_function": index_function, "colormap": colormap}
+    key = get_product_key(band_paths, create_index_visualization, params)
+
+    product = cache.get(key)
+    if product is None:
+        index_data = compute_product(data_dir, date, index_function, cache=cache)
+        product = cache.put(
+            key,
+            create_index_visualization(index_data, colormap),
+            function=_encode_param(create_index_visualization),
+            params=json.dumps(params, sort_keys=True, default=_encode_param),
+        )
+    return product
@@ -3,6 +3,9 @@
 import numpy as np
 from numpy.typing import NDArray
 
+from mimosa import parallel
+from mimosa.parallel import run_row_blocks
+
 # Copernicus Browser standard layer presets
 # Based on https://browser.dataspace.copernicus.eu/ Sentinel-2 layers
 COMPOSITE_PRESETS: dict[str, dict[str, str]] = {
@@ -13,6 +16,9 @@ COMPOSITE_PRESETS: dict[str, dict[str, str]] = {
     "SWIR": {"r": "B12", "g": "B8A", "b": "B04"},
 }
 
+# Histogram bins used to locate percentile ranks in large bands
+PERCENTILE_BINS = 4096
+
 # Index-based layers that require calculation
 INDEX_LAYERS = [
     "NDVI",
@@ -22,6 +28,150 @@ INDEX_LAYERS = [
 ]
 
 
+def _lerp(low: np.floating, high: np.floating, weight: float) -> np.float64:
+    """Interpolate between two order statistics like `np.percentile`."""
+    diff = high - low
+    if weight >= 0.5:
+        return np.float64(high - diff * (1 - weight))
+    return np.float64(low + diff * weight)
+
+
+def _get_valid_values(
+    band: NDArray[np.float32], valid_mask: NDArray[np.bool_] | None, rows: slice
+) -> NDArray[np.float32]:
+    """Get the valid pixel values of a row block."""
+    if valid_mask is None:
+        return band[rows].ravel()
+    return band[rows][valid_mask[rows]]
+
+
+def _get_blocked_range(
+    band: NDArray[np.float32], valid_mask: NDArray[np.bool_] | None
+) -> tuple[int, float, float]:
+    """Get the count, minimum and maximum of the valid pixels by row block."""
+    # Block results keyed by first row
+    stats: dict[int, tuple[int, float, float]] = {}
+
+    def kernel(rows: slice) -> None:
+        values = _get_valid_values(band, valid_mask, rows)
+        if len(values) == 0:
+            stats[rows.start] = (0, np.inf, -np.inf)
+        else:
+            stats[rows.start] = (len(values), float(values.min()), float(values.max()))
+
+    run_row_blocks(kernel, band.shape)
+    counts, lows, highs = zip(*stats.values(), strict=True)
+    # NumPy reductions propagate NaN, unlike the min and max builtins
+    return sum(counts), float(np.min(lows)), float(np.max(highs))
+
+
+def _get_blocked_order_statistics(
+    band: NDArray[np.float32],
+    valid_mask: NDArray[np.bool_] | None,
+    value_range: tuple[float, float],
+    ranks: NDArray[np.intp],
+) -> dict[int, np.floating]:
+    """Select the valid pixel values of given ranks by row block.
+
+    Per-block histograms locate the bin of each rank, then only the values
+    of those bins are gathered and partitioned.
+    """
+    low, high = value_range
+    # Rounded subtraction and scaling are monotonic, so bins are ordered
+    scale = (PERCENTILE_BINS - 1) / (high - low)
+
+    def get_bins(values: NDArray[np.float32]) -> NDArray[np.intp]:
+        bins = ((values - low) * scale).astype(np.intp)
+        return np.clip(bins, 0, PERCENTILE_BINS - 1)
+
+    histograms: dict[int, NDArray[np.intp]] = {}
+
+    def histogram_kernel(rows: slice) -> None:
+        bins = get_bins(_get_valid_values(band, valid_mask, rows))
+        histograms[rows.start] = np.bincount(bins, minlength=PERCENTILE_BINS)
+
+    run_row_blocks(histogram_kernel, band.shape)
+    cumulative = np.cumsum(sum(histograms.values()))
+    rank_bins = np.searchsorted(cumulative, ranks, side="right")
+    needed_bins = np.unique(rank_bins)
+
+    candidates: dict[int, list[NDArray[np.float32]]] = {}
+
+    def select_kernel(rows: slice) -> None:
+        values = _get_valid_values(band, valid_mask, rows)
+        bins = get_bins(values)
+        candidates[rows.start] = [values[bins == b] for b in needed_bins]
+
+    run_row_blocks(select_kernel, band.shape)
+    order_statistics = {}
+    for rank, rank_bin in zip(ranks, rank_bins, strict=True):
+        position = int(np.searchsorted(needed_bins, rank_bin))
+        values = np.concatenate([block[position] for block in candidates.values()])
+        offset = rank - (cumulative[rank_bin - 1] if rank_bin > 0 else 0)
+        order_statistics[int(rank)] = np.partition(values, offset)[offset]
+    return order_statistics
+
+
+def get_percentile_range(
+    band: NDArray[np.float32],
+    mask: NDArray[np.uint8] | None = None,
+    percentile_clip: tuple[float, float] = (2, 98),
+) -> tuple[np.float64, np.float64]:
+    """Get the low and high percentiles of the valid pixels of a band.
+
+    Large bands are processed in row blocks on the shared thread pool:
+    per-block histograms locate the bins holding the percentile ranks, then
+    only the values of those bins are partitioned. The result is the same as
+    `np.percentile` over the valid pixels, whatever the thread count.
+
+    Parameters
+    ----------
+    band : NDArray[np.float32]
+        Band data array (H, W), or flat (N,) from `compress_scene`.
+    mask : NDArray[np.uint8] | None
+        Optional mask where 255=valid, 0=invalid.
+    percentile_clip : tuple[float, float]
+        Lower and upper percentiles, by default (2, 98).
+
+    Returns
+    -------
+    tuple[np.float64, np.float64]
+        Low and high percentiles, (0.0, 1.0) if there are no valid pixels.
+
+    """
+    valid_mask = None if mask is None else mask == 255
+    if band.size >= parallel.PARALLEL_MIN_PIXELS:
+        count, low, high = _get_blocked_range(band, valid_mask)
+    # NaN ranges propagate like np.percentile through the serial path
+    if band.size < parallel.PARALLEL_MIN_PIXELS or np.isnan(low + high):
+        valid_pixels = _get_valid_values(band, valid_mask, slice(None))
+        if len(valid_pixels) == 0:
+            # Fallback if no valid pixels
+            return np.float64(0.0), np.float64(1.0)
+        p_low, p_high = np.percentile(valid_pixels, percentile_clip)
+        return np.float64(p_low), np.float64(p_high)
+    if count == 0:
+        return np.float64(0.0), np.float64(1.0)
+    if low == high:
+        return np.float64(low), np.float64(high)
+
+    # Same virtual index and weight as the 'linear' method of np.percentile
+    quantiles = np.asarray(percentile_clip, dtype=np.float64) / 100
+    virtual = (count - 1) * quantiles
+    previous = np.floor(virtual).astype(np.intp)
+    following = np.minimum(previous + 1, count - 1)
+    weights = virtual - np.floor(virtual)
+    order_statistics = _get_blocked_order_statistics(
+        band, valid_mask, (low, high), np.unique([*previous, *following])
+    )
+
+    p_low, p_high = (
+        _lerp(order_statistics[prev], order_statistics[nxt], weight)
+        for prev, nxt, weight in zip(previous, following, weights, strict=True)
+    )
+    return p_low, p_high
+
+
 def normalize_band(
     band: NDArray[np.float32],
     mask: NDArray[np.uint8] | None = None,
@@ -32,7 +182,7 @@ def normalize_band(
     Parameters
     ----------
     band : NDArray[np.float32]
-        Band data array (H, W).
+        Band data array (H, W), or flat (N,) from `compress_scene`.
     mask : NDArray[np.uint8] | None
         Optional mask where 255=valid, 0=invalid. If provided, only valid
         pixels are used for percentile calculation.
@@ -45,32 +195,27 @@ def normalize_band(
         Normalized band values in 0-1 range, masked pixels set to 0.
 
     """
-    # Create boolean mask for valid pixels
+    # Calculate percentiles using only valid pixels
+    p_low, p_high = get_percentile_range(band, mask, percentile_clip)
     if mask is not None:
         valid_mask = mask == 255
-        valid_pixels = band[valid_mask]
-    else:
-        valid_pixels = band.ravel()
 
-    # Calculate percentiles using only valid pixels
-    if len(valid_pixels) > 0:
-        p_low, p_high = np.percentile(valid_pixels, percentile_clip)
-    else:
-        # Fallback if no valid pixels
-        p_low, p_high = 0.0, 1.0
+    normalized = np.zeros(band.shape, dtype=np.float32)
+    # Also catches a NaN range from unmasked NaN pixels
+    if not p_high > p_low:
+        return normalized
 
-    # Clip and normalize
-    normalized = np.clip(band, p_low, p_high)
-    if p_high > p_low:
-        normalized = (normalized - p_low) / (p_high - p_low)
-    else:
-        normalized = np.zeros_like(normalized)
+    def kernel(rows: slice) -> None:
+        # Clip and normalize
+        block = np.clip(band[rows], p_low, p_high)
+        normalized[rows] = (block - p_low) / (p_high - p_low)
 
-    # Set masked pixels to 0
-    if mask is not None:
-        normalized[~valid_mask] = 0
+        # Set masked pixels to 0
+        if mask is not None:
+            normalized[rows][~valid_mask[rows]] = 0
 
-    return normalized.astype(np.float32)
+    run_row_blocks(kernel, band.shape)
+    return normalized
 
 
 def create_rgb_composite(
@@ -101,7 +246,8 @@ def create_rgb_composite(
     Returns
     -------
     NDArray[np.uint8]
-        RGB composite image (H, W, 3) with masked pixels set to black.
+        RGB composite image (H, W, 3) with masked pixels set to black, or
+        (N, 3) for flat bands from `compress_scene`.
 
     """
     # Extract bands
@@ -124,20 +270,22 @@ def create_rgb_composite(
         g_norm = g_data
         b_norm = b_data
 
-    # Combine masks (pixel is valid only if valid in all bands)
-    combined_mask = (r_mask == 255) & (g_mask == 255) & (b_mask == 255)
+    rgb = np.empty((*r_data.shape, 3), dtype=np.uint8)
 
-    # Convert to uint8 (0-255)
-    r_uint8 = (r_norm * 255).astype(np.uint8)
-    g_uint8 = (g_norm * 255).astype(np.uint8)
-    b_uint8 = (b_norm * 255).astype(np.uint8)
+    def kernel(rows: slice) -> None:
+        # Convert to uint8 (0-255) directly into the RGB image
+        for channel, norm in enumerate((r_norm, g_norm, b_norm)):
+            rgb[rows, ..., channel] = (norm[rows] * 255).astype(np.uint8)
 
-    # Stack into RGB image
-    rgb = np.stack([r_uint8, g_uint8, b_uint8], axis=-1)
+        # Combine masks (pixel is valid only if valid in all bands)
+        combined_mask = (
+            (r_mask[rows] == 255) & (g_mask[rows] == 255) & (b_mask[rows] == 255)
+        )
 
-    # Set masked pixels to black
-    rgb[~combined_mask] = 0
+        # Set masked pixels to black
+        rgb[rows][~combined_mask] = 0
 
+    run_row_blocks(kernel, r_data.shape)
     return rgb
 
 
@@ -163,6 +311,31 @@ def get_composite_preset(name: str) -> dict[str, str]:
     return COMPOSITE_PRESETS[name]
 
 
+def _normalized_difference(
+    bands: dict[str, NDArray[np.float32]],
+    masks: dict[str, NDArray[np.uint8]],
+    band_a: str,
+    band_b: str,
+) -> NDArray[np.float32]:
+    """Calculate (A - B) / (A + B) with masked pixels set to 0."""
+    a = bands[band_a]
+    b = bands[band_b]
+    mask_a = masks[band_a]
+    mask_b = masks[band_b]
+    result = np.zeros(a.shape, dtype=np.float32)
+
+    def kernel(rows: slice) -> None:
+        combined_mask = (mask_a[rows] == 255) & (mask_b[rows] == 255)
+
+        # Avoid division by zero
+        denominator = a[rows] + b[rows]
+        valid = combined_mask & (denominator != 0)
+        np.divide(a[rows] - b[rows], denominator, out=result[rows], where=valid)
+
+    run_row_blocks(kernel, a.shape)
+    return result
+
+
 def calculate_ndvi(
     bands: dict[str, NDArray[np.float32]],
     masks: dict[str, NDArray[np.uint8]],
@@ -184,20 +357,7 @@ def calculate_ndvi(
         NDVI values in range [-1, 1], masked pixels set to 0.
 
     """
-    nir = bands["B08"]
-    red = bands["B04"]
-    combined_mask = (masks["B08"] == 255) & (masks["B04"] == 255)
-
-    # Avoid division by zero
-    denominator = nir + red
-    ndvi = np.zeros_like(nir)
-    valid = combined_mask & (denominator != 0)
-    ndvi[valid] = (nir[valid] - red[valid]) / denominator[valid]
-
-    # Set masked pixels to 0
-    ndvi[~combined_mask] = 0
-
-    return ndvi.astype(np.float32)
+    return _normalized_difference(bands, masks, "B08", "B04")
 
 
 def calculate_moisture_index(
@@ -221,20 +381,7 @@ def calculate_moisture_index(
         Moisture index values in range [-1, 1], masked pixels set to 0.
 
     """
-    nir_narrow = bands["B8A"]
-    swir1 = bands["B11"]
-    combined_mask = (masks["B8A"] == 255) & (masks["B11"] == 255)
-
-    # Avoid division by zero
-    denominator = nir_narrow + swir1
-    moisture = np.zeros_like(nir_narrow)
-    valid = combined_mask & (denominator != 0)
-    moisture[valid] = (nir_narrow[valid] - swir1[valid]) / denominator[valid]
-
-    # Set masked pixels to 0
-    moisture[~combined_mask] = 0
-
-    return moisture.astype(np.float32)
+    return _normalized_difference(bands, masks, "B8A", "B11")
 
 
 def calculate_ndwi(
@@ -258,20 +405,7 @@ def calculate_ndwi(
         NDWI values in range [-1, 1], masked pixels set to 0.
 
     """
-    green = bands["B03"]
-    nir = bands["B08"]
-    combined_mask = (masks["B03"] == 255) & (masks["B08"] == 255)
-
-    # Avoid division by zero
-    denominator = green + nir
-    ndwi = np.zeros_like(green)
-    valid = combined_mask & (denominator != 0)
-    ndwi[valid] = (green[valid] - nir[valid]) / denominator[valid]
-
-    # Set masked pixels to 0
-    ndwi[~combined_mask] = 0
-
-    return ndwi.astype(np.float32)
+    return _normalized_difference(bands, masks, "B03", "B08")
 
 
 def calculate_ndsi(
@@ -295,20 +429,7 @@ def calculate_ndsi(
         NDSI values in range [-1, 1], masked pixels set to 0.
 
     """
-    green = bands["B03"]
-    swir1 = bands["B11"]
-    combined_mask = (masks["B03"] == 255) & (masks["B11"] == 255)
-
-    # Avoid division by zero
-    denominator = green + swir1
-    ndsi = np.zeros_like(green)
-    valid = combined_mask & (denominator != 0)
-    ndsi[valid] = (green[valid] - swir1[valid]) / denominator[valid]
-
-    # Set masked pixels to 0
-    ndsi[~combined_mask] = 0
-
-    return ndsi.astype(np.float32)
+    return _normalized_difference(bands, masks, "B03", "B11")
 
 
 def create_index_visualization(
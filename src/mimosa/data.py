@@ -2,6 +2,7 @@
 
 from datetime import datetime
 from pathlib import Path
+from typing import Any
 
 import numpy as np
 import rasterio
@@ -94,9 +95,9 @@ def load_true_color(
         # Read RGB data (3 bands, float32 in 0-1 range)
         data = src.read()  # Shape: (3, H, W)
 
-        # Convert to uint8 for display
-        img = (data * 255).astype(np.uint8)
-        img = np.transpose(img, (1, 2, 0))  # Convert to HWC format
+        # Convert to uint8 for display, writing directly into HWC format
+        img = np.empty((*data.shape[1:], data.shape[0]), dtype=np.uint8)
+        np.multiply(np.moveaxis(data, 0, -1), 255, out=img, casting="unsafe")
 
         # Read mask (255=valid, 0=invalid)
         # Use first band's mask (all bands should have same mask)
@@ -105,24 +106,27 @@ def load_true_color(
     return img, mask
 
 
-def load_band(
-    data_dir: Path, date: datetime, band: str
-) -> tuple[NDArray[np.float32], NDArray[np.uint8]]:
-    """Load a single spectral band and its mask for a given date.
+def get_band_path(data_dir: Path, date: datetime, band: str) -> Path:
+    """Get the TIFF file path of a spectral band for a given date.
 
     Parameters
     ----------
     data_dir : Path
         Root directory containing Sentinel-2 data.
     date : datetime
-        Acquisition date to load.
+        Acquisition date.
     band : str
         Band identifier (e.g., 'B04', 'B8A').
 
     Returns
     -------
-    tuple[NDArray[np.float32], NDArray[np.uint8]]
-        Band data array (H, W) and mask array (H, W) where 255=valid, 0=masked.
+    Path
+        Path to the band TIFF file.
+
+    Raises
+    ------
+    FileNotFoundError
+        If no TIFF exists for the band and date.
 
     """
     date_dir = get_date_directory(data_dir, date)
@@ -132,8 +136,55 @@ def load_band(
     if not band_files:
         msg = f"No TIFF found for band {band} in {date_dir}"
         raise FileNotFoundError(msg)
+    return band_files[0]
+
+
+def load_band_profile(
+    data_dir: Path, date: datetime, band: str = "B04"
+) -> dict[str, Any]:
+    """Load the raster profile (CRS, transform, shape) of a spectral band.
+
+    Parameters
+    ----------
+    data_dir : Path
+        Root directory containing Sentinel-2 data.
+    date : datetime
+        Acquisition date.
+    band : str
+        Band identifier, by default 'B04'.
+
+    Returns
+    -------
+    dict[str, Any]
+        Rasterio profile of the band TIFF, usable as a reference grid when
+        writing derived products.
 
-    with rasterio.open(band_files[0]) as src:
+    """
+    with rasterio.open(get_band_path(data_dir, date, band)) as src:
+        return dict(src.profile)
+
+
+def load_band(
+    data_dir: Path, date: datetime, band: str
+) -> tuple[NDArray[np.float32], NDArray[np.uint8]]:
+    """Load a single spectral band and its mask for a given date.
+
+    Parameters
+    ----------
+    data_dir : Path
+        Root directory containing Sentinel-2 data.
+    date : datetime
+        Acquisition date to load.
+    band : str
+        Band identifier (e.g., 'B04', 'B8A').
+
+    Returns
+    -------
+    tuple[NDArray[np.float32], NDArray[np.uint8]]
+        Band data array (H, W) and mask array (H, W) where 255=valid, 0=masked.
+
+    """
+    with rasterio.open(get_band_path(data_dir, date, band)) as src:
         # Read band data (float32, already normalized to 0-1 range)
         data = src.read(1).astype(np.float32)
 
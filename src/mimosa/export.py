@@ -0,0 +1,227 @@
+"""Tiled, compressed GeoTIFF writers for derived products."""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import rasterio
+from numpy.typing import DTypeLike, NDArray
+from rasterio.enums import Resampling
+from rasterio.io import DatasetWriter
+from rasterio.windows import Window
+
+# Tile size (pixels) of written GeoTIFFs, also the size below which no
+# further overview level is built
+GEOTIFF_BLOCKSIZE = 512
+
+# Supported compression codecs
+GEOTIFF_COMPRESSIONS = ["deflate", "zstd"]
+
+
+def get_overview_factors(
+    shape: tuple[int, int], blocksize: int = GEOTIFF_BLOCKSIZE
+) -> list[int]:
+    """Get power-of-two overview factors down to a single tile.
+
+    Parameters
+    ----------
+    shape : tuple[int, int]
+        Raster shape (H, W).
+    blocksize : int
+        Tile size in pixels, by default GEOTIFF_BLOCKSIZE.
+
+    Returns
+    -------
+    list[int]
+        Decimation factors (2, 4, 8, ...) until the coarsest overview fits
+        in one tile. Empty if the raster already fits in one tile.
+
+    """
+    size = max(shape)
+    factors = []
+    factor = 2
+    while size / (factor // 2) > blocksize:
+        factors.append(factor)
+        factor *= 2
+    return factors
+
+
+def _creation_profile(
+    reference: dict[str, Any],
+    count: int,
+    dtype: DTypeLike,
+    compress: str,
+    blocksize: int,
+) -> dict[str, Any]:
+    """Build GTiff creation options on the reference grid."""
+    if compress not in GEOTIFF_COMPRESSIONS:
+        msg = (
+            f"Unknown compression {compress!r}, expected one of {GEOTIFF_COMPRESSIONS}"
+        )
+        raise ValueError(msg)
+
+    dtype = np.dtype(dtype)
+    if dtype == np.bool_:
+        msg = "Cannot write bool data, convert it to uint8 (e.g. 0/255) first"
+        raise ValueError(msg)
+    if dtype in (np.float32, np.float64):
+        # Floating point predictor, only supported for 32 and 64 bit floats
+        predictor = 3
+    elif np.issubdtype(dtype, np.floating):
+        predictor = 1
+    else:
+        # Horizontal differencing for integers
+        predictor = 2
+    return {
+        "driver": "GTiff",
+        "width": reference["width"],
+        "height": reference["height"],
+        "crs": reference.get("crs"),
+        "transform": reference.get("transform"),
+        "count": count,
+        "dtype": dtype.name,
+        "tiled": True,
+        "blockxsize": blocksize,
+        "blockysize": blocksize,
+        "interleave": "pixel" if count > 1 else "band",
+        "compress": compress,
+        "predictor": predictor,
+        "num_threads": "ALL_CPUS",
+        "bigtiff": "IF_SAFER",
+    }
+
+
+@contextmanager
+def open_geotiff(
+    path: Path,
+    reference: dict[str, Any],
+    count: int = 1,
+    dtype: DTypeLike = np.float32,
+    compress: str = "deflate",
+    blocksize: int = GEOTIFF_BLOCKSIZE,
+    overview_resampling: str = "average",
+) -> Iterator[DatasetWriter]:
+    """Open a tiled, compressed GeoTIFF for incremental block writes.
+
+    The file keeps the CRS and transform of the reference profile. Internal
+    overviews are built when the context exits without error.
+
+    Parameters
+    ----------
+    path : Path
+        Output GeoTIFF path.
+    reference : dict[str, Any]
+        Reference profile providing 'width', 'height', 'crs' and 'transform',
+        for example from `load_band_profile`.
+    count : int
+        Number of bands, by default 1.
+    dtype : DTypeLike
+        Output data type, by default float32.
+    compress : str
+        Compression codec from GEOTIFF_COMPRESSIONS, by default 'deflate'.
+    blocksize : int
+        Tile size in pixels, by default GEOTIFF_BLOCKSIZE.
+    overview_resampling : str
+        Overview resampling method, by default 'average'. Use 'nearest' for
+        masks and class maps.
+
+    Yields
+    ------
+    DatasetWriter
+        Open rasterio dataset, written with `write(..., window=...)` and
+        `write_mask(..., window=...)`.
+
+    Raises
+    ------
+    ValueError
+        If the compression codec is unknown or the data type is bool.
+
+    """
+    profile = _creation_profile(reference, count, dtype, compress, blocksize)
+    with rasterio.open(path, "w", **profile) as dst:
+        yield dst
+
+        factors = get_overview_factors((dst.height, dst.width), blocksize)
+        if factors:
+            dst.build_overviews(factors, Resampling[overview_resampling])
+            dst.update_tags(ns="rio_overview", resampling=overview_resampling)
+
+
+def write_geotiff(
+    path: Path,
+    data: NDArray[Any],
+    reference: dict[str, Any],
+    mask: NDArray[np.uint8] | None = None,
+    compress: str = "deflate",
+    blocksize: int = GEOTIFF_BLOCKSIZE,
+    overview_resampling: str | None = None,
+) -> None:
+    """Write an index raster, composite or mask as a tiled GeoTIFF.
+
+    Parameters
+    ----------
+    path : Path
+        Output GeoTIFF path.
+    data : NDArray[Any]
+        Single band raster (H, W), e.g. an index or mask, or multi-channel
+        image (H, W, C), e.g. an RGB composite. Bool data is written as
+        uint8 with 255=True, 0=False.
+    reference : dict[str, Any]
+        Reference profile providing 'width', 'height', 'crs' and 'transform',
+        for example from `load_band_profile`.
+    mask : NDArray[np.uint8] | None
+        Optional mask (H, W) where 255=valid, 0=invalid, stored as the
+        internal dataset mask.
+    compress : str
+        Compression codec from GEOTIFF_COMPRESSIONS, by default 'deflate'.
+    blocksize : int
+        Tile size in pixels, by default GEOTIFF_BLOCKSIZE.
+    overview_resampling : str | None
+        Overview resampling method, by default 'average' for floating point
+        data and 'nearest' otherwise.
+
+    Raises
+    ------
+    ValueError
+        If the data shape does not match the reference grid or the
+        compression codec is unknown.
+
+    """
+    height, width = data.shape[:2]
+    if (height, width) != (reference["height"], reference["width"]):
+        msg = (
+            f"Data shape {(height, width)} does not match reference grid "
+            f"{(reference['height'], reference['width'])}"
+        )
+        raise ValueError(msg)
+
+    if data.dtype == np.bool_:
+        # Same convention as masks
+        data = np.where(data, np.uint8(255), np.uint8(0))
+    if overview_resampling is None:
+        floating = np.issubdtype(data.dtype, np.floating)
+        overview_resampling = "average" if floating else "nearest"
+    count = 1 if data.ndim == 2 else data.shape[2]
+
+    with open_geotiff(
+        path,
+        reference,
+        count=count,
+        dtype=data.dtype,
+        compress=compress,
+        blocksize=blocksize,
+        overview_resampling=overview_resampling,
+    ) as dst:
+        # Write one row of tiles at a time
+        for row in range(0, height, blocksize):
+            rows = slice(row, min(row + blocksize, height))
+            window = Window(0, row, width, rows.stop - row)
+            block = data[rows]
+            if block.ndim == 2:
+                dst.write(block, 1, window=window)
+            else:
+                dst.write(np.moveaxis(block, -1, 0), window=window)
+            if mask is not None:
+                dst.write_mask(mask[rows], window=window)
@@ -0,0 +1,130 @@
+"""Temporal mosaic of valid observations across acquisition dates."""
+
+from collections.abc import Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+
+from mimosa.parallel import run_tasks
+
+# Default number of rows processed per block, bounds peak memory to roughly
+# T x chunk_rows x W values per band
+MOSAIC_CHUNK_ROWS = 256
+
+
+def _percentile_block(
+    scenes: Sequence[
+        tuple[dict[str, NDArray[np.float32]], dict[str, NDArray[np.uint8]]]
+    ],
+    band_id: str,
+    rows: slice,
+    percentile: float,
+) -> tuple[NDArray[np.float32], NDArray[np.intp]]:
+    """Compute a per-pixel percentile of valid observations for a row block."""
+    # Stack only this row block across dates: (T, rows, W)
+    data = np.stack([bands[band_id][rows] for bands, _ in scenes])
+    valid = np.stack([masks[band_id][rows] == 255 for _, masks in scenes])
+    count = np.count_nonzero(valid, axis=0)
+
+    # Invalid observations sort after every valid one
+    data[~valid] = np.inf
+    flat = data.reshape(len(scenes), -1)
+    flat_count = count.ravel()
+
+    result = np.zeros(flat.shape[1], dtype=np.float32)
+    # Pixels sharing a valid count share the selection ranks
+    for n in np.unique(flat_count):
+        if n == 0:
+            continue
+        columns = np.flatnonzero(flat_count == n)
+        rank = percentile / 100 * (n - 1)
+        lower = int(np.floor(rank))
+        upper = min(lower + 1, n - 1)
+        selected = np.partition(flat[:, columns], [lower, upper], axis=0)
+        low, high = selected[lower], selected[upper]
+        result[columns] = low + (high - low) * (rank - lower)
+
+    return result.reshape(count.shape), count
+
+
+def create_temporal_mosaic(
+    scenes: Sequence[
+        tuple[dict[str, NDArray[np.float32]], dict[str, NDArray[np.uint8]]]
+    ],
+    percentile: float = 50,
+    band_ids: Sequence[str] | None = None,
+    chunk_rows: int = MOSAIC_CHUNK_ROWS,
+) -> tuple[dict[str, NDArray[np.float32]], dict[str, NDArray[np.uint8]]]:
+    """Create a best-available composite from several acquisition dates.
+
+    Each output pixel is a percentile (the median by default) of the valid
+    observations of that pixel across dates. Row blocks are processed
+    independently on the shared thread pool (see `set_num_threads`) so peak
+    memory is bounded by the block size rather than the full (T, B, H, W)
+    stack.
+
+    Parameters
+    ----------
+    scenes : Sequence[tuple[dict, dict]]
+        Band and mask dictionaries per date, as returned by `load_all_bands`.
+    percentile : float
+        Percentile of valid observations to select, by default 50 (median).
+    band_ids : Sequence[str] | None
+        Bands to composite, by default all bands of the first scene.
+    chunk_rows : int
+        Number of rows per block, by default MOSAIC_CHUNK_ROWS.
+
+    Returns
+    -------
+    tuple[dict[str, NDArray[np.float32]], dict[str, NDArray[np.uint8]]]
+        Dictionary of composite band arrays and dictionary of mask arrays
+        where 255=at least one valid observation, 0=none. Pixels without
+        valid observations are set to 0.
+
+    Raises
+    ------
+    ValueError
+        If no scenes are given, the percentile is outside [0, 100], the
+        chunk rows are not positive or band shapes differ across scenes.
+
+    """
+    if not scenes:
+        msg = "At least one scene is required"
+        raise ValueError(msg)
+    if not 0 <= percentile <= 100:
+        msg = f"Percentile must be in [0, 100], got {percentile}"
+        raise ValueError(msg)
+    if chunk_rows <= 0:
+        msg = f"Chunk rows must be positive, got {chunk_rows}"
+        raise ValueError(msg)
+
+    if band_ids is None:
+        band_ids = list(scenes[0][0])
+    for band_id in band_ids:
+        shapes = {bands[band_id].shape for bands, _ in scenes}
+        shapes |= {masks[band_id].shape for _, masks in scenes}
+        if len(shapes) > 1:
+            msg = f"Band {band_id} shapes differ across scenes: {sorted(shapes)}"
+            raise ValueError(msg)
+
+    bands = {}
+    masks = {}
+    tasks: list[tuple[str, slice]] = []
+    for band_id in band_ids:
+        height, width = scenes[0][0][band_id].shape
+        bands[band_id] = np.zeros((height, width), dtype=np.float32)
+        masks[band_id] = np.zeros((height, width), dtype=np.uint8)
+        tasks.extend(
+            (band_id, slice(start, min(start + chunk_rows, height)))
+            for start in range(0, height, chunk_rows)
+        )
+
+    def run(task: tuple[str, slice]) -> None:
+        band_id, rows = task
+        values, count = _percentile_block(scenes, band_id, rows, percentile)
+        bands[band_id][rows] = values
+        masks[band_id][rows] = np.where(count > 0, 255, 0)
+
+    run_tasks(run, tasks)
+
+    return bands, masks
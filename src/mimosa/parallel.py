@@ -0,0 +1,153 @@
+"""Multithreaded row-block execution for array kernels."""
+
+import os
+import threading
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from math import prod
+
+# Target number of elements per row block, small enough for a block of each
+# operand to stay cache resident
+PARALLEL_BLOCK_PIXELS = 1 << 16
+
+# Arrays with fewer elements than this are processed serially
+PARALLEL_MIN_PIXELS = 1 << 17
+
+_executor: ThreadPoolExecutor | None = None
+_num_threads: int | None = None
+_lock = threading.Lock()
+_worker = threading.local()
+
+
+def get_num_threads() -> int:
+    """Get the number of threads used by the shared pool.
+
+    Returns
+    -------
+    int
+        Thread count set by `set_num_threads`, else the MIMOSA_NUM_THREADS
+        environment variable, else the number of usable CPUs.
+
+    """
+    if _num_threads is not None:
+        return _num_threads
+    env_threads = os.environ.get("MIMOSA_NUM_THREADS")
+    if env_threads:
+        return max(1, int(env_threads))
+    return os.process_cpu_count() or 1
+
+
+def set_num_threads(num_threads: int | None) -> None:
+    """Set the number of threads used by the shared pool.
+
+    Parameters
+    ----------
+    num_threads : int | None
+        Thread count, 1 disables threading. None restores the default.
+
+    Raises
+    ------
+    ValueError
+        If the thread count is lower than 1.
+
+    """
+    global _executor, _num_threads
+    if num_threads is not None and num_threads < 1:
+        msg = f"Thread count must be at least 1, got {num_threads}"
+        raise ValueError(msg)
+    with _lock:
+        _num_threads = num_threads
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
+
+
+def _mark_worker() -> None:
+    """Flag pool threads so nested kernels run serially."""
+    _worker.active = True
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get the shared thread pool, creating it on first use."""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=get_num_threads(),
+                thread_name_prefix="mimosa",
+                initializer=_mark_worker,
+            )
+        return _executor
+
+
+def get_row_blocks(shape: tuple[int, ...]) -> list[slice]:
+    """Split the first axis of an array into cache-friendly row blocks.
+
+    Parameters
+    ----------
+    shape : tuple[int, ...]
+        Array shape, rows along the first axis.
+
+    Returns
+    -------
+    list[slice]
+        Contiguous row slices of about PARALLEL_BLOCK_PIXELS elements each.
+
+    """
+    height = shape[0]
+    row_size = prod(shape[1:])
+    block_rows = max(1, PARALLEL_BLOCK_PIXELS // max(row_size, 1))
+    return [
+        slice(start, min(start + block_rows, height))
+        for start in range(0, height, block_rows)
+    ]
+
+
+def run_tasks[T](func: Callable[[T], None], tasks: Sequence[T]) -> None:
+    """Run a function over independent tasks on the shared thread pool.
+
+    A thread count of 1, a single task and calls from pool threads run
+    serially in task order.
+
+    Parameters
+    ----------
+    func : Callable[[T], None]
+        Function processing one task and writing into preallocated outputs.
+    tasks : Sequence[T]
+        Task arguments, e.g. (band, row slice) pairs.
+
+    """
+    if len(tasks) <= 1 or get_num_threads() == 1 or getattr(_worker, "active", False):
+        for task in tasks:
+            func(task)
+        return
+
+    # Consume results to propagate task exceptions
+    list(_get_executor().map(func, tasks))
+
+
+def run_row_blocks(func: Callable[[slice], None], shape: tuple[int, ...]) -> None:
+    """Run a kernel over row blocks on the shared thread pool.
+
+    The kernel is called once per row block and must write its results into
+    preallocated outputs, so results are identical to a single serial call.
+    Small arrays, a thread count of 1 and calls from pool threads run
+    serially as a single block.
+
+    Parameters
+    ----------
+    func : Callable[[slice], None]
+        Kernel processing the rows selected by a slice.
+    shape : tuple[int, ...]
+        Shape of the processed arrays, rows along the first axis.
+
+    """
+    serial = (
+        prod(shape) < PARALLEL_MIN_PIXELS
+        or get_num_threads() == 1
+        or getattr(_worker, "active", False)
+    )
+    if serial:
+        func(slice(0, shape[0]))
+        return
+    run_tasks(func, get_row_blocks(shape))
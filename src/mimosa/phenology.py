@@ -0,0 +1,201 @@
+"""Per-pixel seasonal curve fitting and bloom timing."""
+
+from collections.abc import Sequence
+from datetime import datetime
+
+import numpy as np
+from numpy.typing import NDArray
+
+# Default number of pixels fitted per chunk
+PHENOLOGY_CHUNK_PIXELS = 16384
+
+# Mean year length used for the harmonic period
+DAYS_PER_YEAR = 365.25
+
+# Maximum default number of annual harmonics, enough for the curve width to
+# follow short bloom pulses instead of being fixed by a single cosine. Needs 8
+# dates, shorter series such as the 5-date bundled dataset get fewer harmonics
+PHENOLOGY_HARMONICS = 3
+
+
+def get_day_of_year(dates: Sequence[datetime]) -> NDArray[np.float64]:
+    """Get the day of year (1-based) of each date.
+
+    Parameters
+    ----------
+    dates : Sequence[datetime]
+        Acquisition dates, possibly spanning several years.
+
+    Returns
+    -------
+    NDArray[np.float64]
+        Day of year of each date.
+
+    """
+    return np.array([date.timetuple().tm_yday for date in dates], dtype=np.float64)
+
+
+def get_harmonic_design(
+    days: NDArray[np.float64], n_harmonics: int = 1
+) -> NDArray[np.float64]:
+    """Build the design matrix of an annual harmonic model.
+
+    Parameters
+    ----------
+    days : NDArray[np.float64]
+        Day of year of each sample (T,).
+    n_harmonics : int
+        Number of annual harmonics, by default 1.
+
+    Returns
+    -------
+    NDArray[np.float64]
+        Design matrix (T, 1 + 2 * n_harmonics) with columns
+        1, cos(h w t), sin(h w t) for h = 1 ... n_harmonics.
+
+    """
+    angle = 2 * np.pi * days / DAYS_PER_YEAR
+    columns = [np.ones_like(days)]
+    for harmonic in range(1, n_harmonics + 1):
+        columns.extend([np.cos(harmonic * angle), np.sin(harmonic * angle)])
+    return np.stack(columns, axis=-1)
+
+
+def _fit_chunk(
+    values: NDArray[np.float64],
+    weights: NDArray[np.float64],
+    design: NDArray[np.float64],
+) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """Fit every pixel of a chunk by weighted least squares.
+
+    Returns coefficients (n, k) and R² (n,) for values and 0/1 weights (n, T).
+    """
+    # Batched normal equations, one (k, k) system per pixel
+    gram = np.einsum("nt,ti,tj->nij", weights, design, design)
+    moments = np.einsum("nt,ti->ni", weights * values, design)
+    coefficients = (np.linalg.pinv(gram) @ moments[..., None])[..., 0]
+
+    count = weights.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = (weights * values).sum(axis=1) / count
+        ss_res = (weights * (values - coefficients @ design.T) ** 2).sum(axis=1)
+        ss_tot = (weights * (values - mean[:, None]) ** 2).sum(axis=1)
+        r_squared = 1 - ss_res / ss_tot
+    return coefficients, r_squared
+
+
+def fit_phenology(
+    dates: Sequence[datetime],
+    stack: NDArray[np.floating],
+    masks: NDArray[np.uint8] | None = None,
+    n_harmonics: int | None = None,
+    threshold: float = 0.5,
+    min_observations: int | None = None,
+    chunk_pixels: int = PHENOLOGY_CHUNK_PIXELS,
+) -> dict[str, NDArray[np.float32]]:
+    """Fit a seasonal curve per pixel and derive onset, peak and end dates.
+
+    Each pixel time series is fitted with an annual harmonic model by
+    weighted least squares, solved for all pixels of a chunk at once. The
+    fitted curve is evaluated daily over one year: the peak is its maximum,
+    onset and end are where it crosses `threshold` of its amplitude before
+    and after the peak. Multi-year stacks yield one mean seasonal cycle.
+
+    Parameters
+    ----------
+    dates : Sequence[datetime]
+        Acquisition date of each stack layer.
+    stack : NDArray[np.floating]
+        Index or bloom score stack (T, H, W), e.g. from `calculate_ndvi` per
+        date. Can be a memory-mapped array, only one chunk is read at a time.
+    masks : NDArray[np.uint8] | None
+        Optional mask stack (T, H, W) where 255=valid, 0=invalid. Non-finite
+        values are always ignored.
+    n_harmonics : int | None
+        Number of annual harmonics, by default the most the dates support up
+        to PHENOLOGY_HARMONICS: h harmonics need 2h + 2 dates (8 for 3), and
+        4 dates or fewer fit a single harmonic. A single harmonic places onset
+        and end a fixed distance from the peak.
+    threshold : float
+        Fraction of the seasonal amplitude defining onset and end, by default
+        0.5.
+    min_observations : int | None
+        Minimum number of valid observations to fit a pixel, by default the
+        number of model coefficients plus one.
+    chunk_pixels : int
+        Number of pixels fitted per chunk, by default PHENOLOGY_CHUNK_PIXELS.
+
+    Returns
+    -------
+    dict[str, NDArray[np.float32]]
+        'onset', 'peak' and 'end' day-of-year rasters (H, W) and 'r_squared'
+        fit quality raster (H, W). Pixels with too few observations or a
+        flat series are NaN.
+
+    Raises
+    ------
+    ValueError
+        If the number of dates does not match the stack, or if there are too
+        few dates to fit the model (fewer than 4 with a single harmonic).
+
+    """
+    n_dates, height, width = stack.shape
+    if len(dates) != n_dates:
+        msg = f"Expected {n_dates} dates, got {len(dates)}"
+        raise ValueError(msg)
+
+    if n_harmonics is None:
+        # Most harmonics the dates can fit, at least one
+        n_harmonics = PHENOLOGY_HARMONICS
+        while n_harmonics > 1 and n_dates < (min_observations or 2 * n_harmonics + 2):
+            n_harmonics -= 1
+    design = get_harmonic_design(get_day_of_year(dates), n_harmonics)
+    n_coefficients = design.shape[1]
+    if min_observations is None:
+        min_observations = n_coefficients + 1
+    if n_dates < min_observations:
+        msg = (
+            f"{n_harmonics} harmonics need at least {min_observations} dates, "
+            f"got {n_dates}"
+        )
+        raise ValueError(msg)
+    year = np.arange(365)
+    daily_design = get_harmonic_design(np.arange(1, 366, dtype=np.float64), n_harmonics)
+
+    flat_stack = stack.reshape(n_dates, -1)
+    flat_masks = None if masks is None else masks.reshape(n_dates, -1)
+    results = {
+        name: np.full(height * width, np.nan, dtype=np.float32)
+        for name in ("onset", "peak", "end", "r_squared")
+    }
+
+    for start in range(0, height * width, chunk_pixels):
+        chunk = slice(start, min(start + chunk_pixels, height * width))
+        values = flat_stack[:, chunk].T.astype(np.float64)
+        valid = np.isfinite(values)
+        if flat_masks is not None:
+            valid &= flat_masks[:, chunk].T == 255
+        values[~valid] = 0
+        weights = valid.astype(np.float64)
+
+        coefficients, r_squared = _fit_chunk(values, weights, design)
+
+        curve = coefficients @ daily_design.T  # (n, 365)
+        peak = np.argmax(curve, axis=1)
+        low = curve.min(axis=1)
+        amplitude = curve.max(axis=1) - low
+        below = curve < (low + threshold * amplitude)[:, None]
+
+        # Days after the peak, wrapping around the year
+        offset = (year - peak[:, None]) % 365
+        onset = (peak + np.where(below, offset, -1).max(axis=1) + 1) % 365
+        end = (peak + np.where(below, offset, 365).min(axis=1) - 1) % 365
+
+        fitted = (weights.sum(axis=1) >= min_observations) & (amplitude > 0)
+        fitted &= np.isfinite(r_squared)
+        results["onset"][chunk] = np.where(fitted, onset + 1, np.nan)
+        results["peak"][chunk] = np.where(fitted, peak + 1, np.nan)
+        results["end"][chunk] = np.where(fitted, end + 1, np.nan)
+        results["r_squared"][chunk] = np.where(fitted, r_squared, np.nan)
+
+    return {name: result.reshape(height, width) for name, result in results.items()}
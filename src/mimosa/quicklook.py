@@ -0,0 +1,237 @@
+"""Quicklook pyramid for fast true color previews."""
+
+import warnings
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from functools import cache
+from pathlib import Path
+
+import numpy as np
+import rasterio
+from numpy.typing import NDArray
+from rasterio.enums import Resampling
+from rasterio.errors import NotGeoreferencedWarning
+from rasterio.io import DatasetReader
+
+from mimosa.data import get_date_directory
+
+# Longest-side sizes (pixels) of the reduced pyramid levels, full resolution
+# is always available on top of these
+QUICKLOOK_LEVELS: tuple[int, ...] = (256, 1024)
+
+# Maximum number of cached quicklook levels, least recently used dropped first
+QUICKLOOK_CACHE_ENTRIES = 32
+
+# In-memory pyramid cache keyed by (source path, mtime, level), in least to
+# most recently used order
+_QUICKLOOK_CACHE: dict[
+    tuple[Path, int, int | None], tuple[NDArray[np.uint8], NDArray[np.uint8]]
+] = {}
+
+
+def find_quicklook_source(data_dir: Path, date: datetime) -> Path:
+    """Find the true color image used to build quicklooks for a given date.
+
+    The true color TIFF is preferred, the bundled true color JPEG is used as a
+    fallback when no TIFF exists.
+
+    Parameters
+    ----------
+    data_dir : Path
+        Root directory containing Sentinel-2 data.
+    date : datetime
+        Acquisition date to load.
+
+    Returns
+    -------
+    Path
+        Path to the true color TIFF or JPEG file.
+
+    Raises
+    ------
+    FileNotFoundError
+        If neither a true color TIFF nor JPEG exists for the date.
+
+    """
+    date_dir = get_date_directory(data_dir, date)
+    for pattern in ("*_True_color.tiff", "*_True_color.jpg"):
+        files = sorted(date_dir.glob(pattern))
+        if files:
+            return files[0]
+    msg = f"No true color TIFF or JPEG found in {date_dir}"
+    raise FileNotFoundError(msg)
+
+
+def select_quicklook_level(
+    shape: tuple[int, int],
+    display_size: int | None,
+    levels: tuple[int, ...] = QUICKLOOK_LEVELS,
+) -> int | None:
+    """Select the smallest pyramid level that fits a display size.
+
+    Parameters
+    ----------
+    shape : tuple[int, int]
+        Full resolution image shape (H, W).
+    display_size : int | None
+        Longest side of the display area in pixels. None requests full
+        resolution.
+    levels : tuple[int, ...]
+        Available reduced levels, by default QUICKLOOK_LEVELS.
+
+    Returns
+    -------
+    int | None
+        Longest side of the selected level, or None for full resolution.
+
+    """
+    if display_size is None:
+        return None
+    full_size = max(shape)
+    for level in sorted(levels):
+        if level >= full_size:
+            # Reduced level would not be smaller than the source
+            break
+        if level >= display_size:
+            return level
+    return None
+
+
+@contextmanager
+def _open_source(path: Path) -> Iterator[DatasetReader]:
+    """Open a quicklook source, silencing the missing georeference warning."""
+    # The JPEG quicklook has no CRS nor transform, only pixels are needed
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", NotGeoreferencedWarning)
+        with rasterio.open(path) as src:
+            yield src
+
+
+@cache
+def _source_shape(path: Path, mtime: int) -> tuple[int, int]:  # noqa: ARG001
+    """Get the full resolution shape (H, W) of a quicklook source."""
+    with _open_source(path) as src:
+        return src.height, src.width
+
+
+def _read_level(
+    path: Path, level: int | None
+) -> tuple[NDArray[np.uint8], NDArray[np.uint8]]:
+    """Read a true color image at a pyramid level as uint8 HWC."""
+    with _open_source(path) as src:
+        if level is None:
+            height, width = src.height, src.width
+        else:
+            scale = level / max(src.height, src.width)
+            height = max(1, round(src.height * scale))
+            width = max(1, round(src.width * scale))
+
+        # Decimated reads let GDAL use overviews / JPEG DCT scaling
+        data = src.read(
+            indexes=[1, 2, 3],
+            out_shape=(3, height, width),
+            resampling=Resampling.average,
+        )
+        mask = src.read_masks(
+            1, out_shape=(height, width), resampling=Resampling.nearest
+        )
+
+    if data.dtype == np.uint8:
+        img = np.ascontiguousarray(np.moveaxis(data, 0, -1))
+    else:
+        # Float 0-1 to uint8 in a single pass directly into HWC layout
+        img = np.empty((height, width, 3), dtype=np.uint8)
+        np.multiply(np.moveaxis(data, 0, -1), 255, out=img, casting="unsafe")
+
+    return img, mask
+
+
+def build_quicklook_pyramid(
+    data_dir: Path,
+    date: datetime,
+    levels: tuple[int, ...] = QUICKLOOK_LEVELS,
+) -> dict[int, tuple[NDArray[np.uint8], NDArray[np.uint8]]]:
+    """Build and cache the reduced quicklook levels for a given date.
+
+    Parameters
+    ----------
+    data_dir : Path
+        Root directory containing Sentinel-2 data.
+    date : datetime
+        Acquisition date to load.
+    levels : tuple[int, ...]
+        Longest-side sizes of the levels to build, by default QUICKLOOK_LEVELS.
+
+    Returns
+    -------
+    dict[int, tuple[NDArray[np.uint8], NDArray[np.uint8]]]
+        RGB image (H, W, 3) and mask (H, W) for each level smaller than the
+        source image.
+
+    """
+    path = find_quicklook_source(data_dir, date)
+    shape = _source_shape(path, path.stat().st_mtime_ns)
+
+    pyramid = {}
+    for level in sorted(levels):
+        if level < max(shape):
+            pyramid[level] = load_quicklook(data_dir, date, level, levels)
+    return pyramid
+
+
+def load_quicklook(
+    data_dir: Path,
+    date: datetime,
+    display_size: int | None = None,
+    levels: tuple[int, ...] = QUICKLOOK_LEVELS,
+) -> tuple[NDArray[np.uint8], NDArray[np.uint8]]:
+    """Load the smallest cached true color quicklook fitting a display size.
+
+    Parameters
+    ----------
+    data_dir : Path
+        Root directory containing Sentinel-2 data.
+    date : datetime
+        Acquisition date to load.
+    display_size : int | None
+        Longest side of the display area in pixels, by default None (full
+        resolution).
+    levels : tuple[int, ...]
+        Available reduced levels, by default QUICKLOOK_LEVELS.
+
+    Returns
+    -------
+    tuple[NDArray[np.uint8], NDArray[np.uint8]]
+        RGB image array (H, W, 3) and mask array (H, W) where 255=valid,
+        0=masked. Arrays are shared with the cache and must not be modified.
+        The cache keeps the QUICKLOOK_CACHE_ENTRIES most recently used levels
+        and drops the levels of rewritten sources.
+
+    """
+    path = find_quicklook_source(data_dir, date)
+    mtime = path.stat().st_mtime_ns
+    level = select_quicklook_level(_source_shape(path, mtime), display_size, levels)
+
+    key = (path, mtime, level)
+    if key in _QUICKLOOK_CACHE:
+        # Move to the most recently used end
+        _QUICKLOOK_CACHE[key] = _QUICKLOOK_CACHE.pop(key)
+        return _QUICKLOOK_CACHE[key]
+
+    img, mask = _read_level(path, level)
+    img.flags.writeable = False
+    mask.flags.writeable = False
+    # Levels of a rewritten source are never read again
+    for stale in [k for k in _QUICKLOOK_CACHE if k[0] == path and k[1] != mtime]:
+        del _QUICKLOOK_CACHE[stale]
+    _QUICKLOOK_CACHE[key] = (img, mask)
+    while len(_QUICKLOOK_CACHE) > QUICKLOOK_CACHE_ENTRIES:
+        del _QUICKLOOK_CACHE[next(iter(_QUICKLOOK_CACHE))]
+    return img, mask
+
+
+def clear_quicklook_cache() -> None:
+    """Drop all cached quicklook levels."""
+    _QUICKLOOK_CACHE.clear()
+    _source_shape.cache_clear()
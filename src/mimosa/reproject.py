@@ -0,0 +1,376 @@
+"""Reprojection with reusable precomputed warp maps."""
+
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+from rasterio.crs import CRS
+from rasterio.transform import Affine, array_bounds
+from rasterio.warp import calculate_default_transform, transform
+
+from mimosa.parallel import run_row_blocks
+
+# Supported resampling methods
+REPROJECT_METHODS = [
+    "nearest",
+    "bilinear",
+]
+
+
+@dataclass(frozen=True)
+class WarpMap:
+    """Source-pixel lookup of every target pixel between two grids.
+
+    Attributes
+    ----------
+    profile : dict[str, Any]
+        Target grid with 'crs', 'transform', 'width' and 'height', usable as
+        a reference by `write_geotiff`.
+    source_shape : tuple[int, int]
+        Source grid shape (H, W).
+    nearest : NDArray[np.intp]
+        Flat source index of the nearest pixel (H_t, W_t), -1 outside the
+        source grid.
+    corner : NDArray[np.intp]
+        Flat source index of the top-left bilinear neighbour (H_t, W_t), -1
+        outside the source grid.
+    weights : NDArray[np.float32]
+        Bilinear row and column fractions (H_t, W_t, 2) from the corner.
+
+    """
+
+    profile: dict[str, Any]
+    source_shape: tuple[int, int]
+    nearest: NDArray[np.intp]
+    corner: NDArray[np.intp]
+    weights: NDArray[np.float32]
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """Target grid shape (H_t, W_t)."""
+        return (self.profile["height"], self.profile["width"])
+
+
+# Warp maps keyed by (source grid, target CRS, resolution)
+_WARP_CACHE: dict[tuple[Any, ...], WarpMap] = {}
+
+
+def get_target_grid(
+    reference: dict[str, Any],
+    dst_crs: str | CRS = "EPSG:3857",
+    resolution: float | None = None,
+) -> dict[str, Any]:
+    """Get the grid covering a reference grid in another CRS.
+
+    Parameters
+    ----------
+    reference : dict[str, Any]
+        Source profile providing 'width', 'height', 'crs' and 'transform',
+        for example from `load_band_profile`.
+    dst_crs : str | CRS
+        Target CRS, by default 'EPSG:3857'.
+    resolution : float | None
+        Target pixel size in target CRS units, by default about the source
+        resolution.
+
+    Returns
+    -------
+    dict[str, Any]
+        Target grid with 'crs', 'transform', 'width' and 'height'.
+
+    """
+    dst_crs = CRS.from_user_input(dst_crs)
+    width, height = reference["width"], reference["height"]
+    dst_transform, dst_width, dst_height = calculate_default_transform(
+        reference["crs"],
+        dst_crs,
+        width,
+        height,
+        *array_bounds(height, width, reference["transform"]),
+        resolution=resolution,
+    )
+    return {
+        "crs": dst_crs,
+        "transform": dst_transform,
+        "width": dst_width,
+        "height": dst_height,
+    }
+
+
+def _apply_affine(
+    affine: Affine, xs: NDArray[np.float64], ys: NDArray[np.float64]
+) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """Apply an affine transform to coordinate arrays."""
+    return (
+        affine.a * xs + affine.b * ys + affine.c,
+        affine.d * xs + affine.e * ys + affine.f,
+    )
+
+
+def get_warp_map(
+    reference: dict[str, Any],
+    dst_crs: str | CRS = "EPSG:3857",
+    resolution: float | None = None,
+) -> WarpMap:
+    """Get the warp map from a source grid to another CRS, cached per grid.
+
+    The coordinate transform runs once per (source grid, target grid), every
+    band, index and date on the same grid then reuses the map.
+
+    Parameters
+    ----------
+    reference : dict[str, Any]
+        Source profile providing 'width', 'height', 'crs' and 'transform',
+        for example from `load_band_profile`.
+    dst_crs : str | CRS
+        Target CRS, by default 'EPSG:3857'. Use 'EPSG:4326' for WGS84.
+    resolution : float | None
+        Target pixel size in target CRS units, by default about the source
+        resolution.
+
+    Returns
+    -------
+    WarpMap
+        Read-only lookup map for `reproject_array` and `reproject_scene`.
+
+    """
+    src_crs = CRS.from_user_input(reference["crs"])
+    dst_crs = CRS.from_user_input(dst_crs)
+    height, width = reference["height"], reference["width"]
+    key = (
+        src_crs.to_wkt(),
+        tuple(reference["transform"]),
+        (height, width),
+        dst_crs.to_wkt(),
+        resolution,
+    )
+    if key in _WARP_CACHE:
+        return _WARP_CACHE[key]
+
+    profile = get_target_grid(reference, dst_crs, resolution)
+    dst_height, dst_width = profile["height"], profile["width"]
+
+    # Target pixel centers in target CRS, then in source CRS
+    cols, rows = np.meshgrid(np.arange(dst_width) + 0.5, np.arange(dst_height) + 0.5)
+    xs, ys = _apply_affine(profile["transform"], cols.ravel(), rows.ravel())
+    if dst_crs != src_crs:
+        xs, ys = (np.asarray(coords) for coords in transform(dst_crs, src_crs, xs, ys))
+
+    # Continuous source pixel coordinates, integers at pixel centers
+    src_cols, src_rows = _apply_affine(~reference["transform"], xs, ys)
+    src_cols = src_cols.reshape(dst_height, dst_width) - 0.5
+    src_rows = src_rows.reshape(dst_height, dst_width) - 0.5
+    inside = (
+        (src_rows >= -0.5)
+        & (src_rows < height - 0.5)
+        & (src_cols >= -0.5)
+        & (src_cols < width - 0.5)
+    )
+
+    nearest_rows = np.floor(src_rows + 0.5).astype(np.intp)
+    nearest_cols = np.floor(src_cols + 0.5).astype(np.intp)
+    nearest = np.where(inside, nearest_rows * width + nearest_cols, -1)
+
+    # Clamp so the 2x2 neighbourhood stays on the grid, edges replicate
+    clamped_rows = np.clip(src_rows, 0, height - 1)
+    clamped_cols = np.clip(src_cols, 0, width - 1)
+    corner_rows = np.minimum(np.floor(clamped_rows), max(height - 2, 0))
+    corner_cols = np.minimum(np.floor(clamped_cols), max(width - 2, 0))
+    corner = np.where(inside, (corner_rows * width + corner_cols).astype(np.intp), -1)
+    weights = np.stack(
+        [clamped_rows - corner_rows, clamped_cols - corner_cols], axis=-1
+    ).astype(np.float32)
+
+    for array in (nearest, corner, weights):
+        array.flags.writeable = False
+    warp_map = WarpMap(profile, (height, width), nearest, corner, weights)
+    _WARP_CACHE[key] = warp_map
+    return warp_map
+
+
+def clear_warp_cache() -> None:
+    """Drop all cached warp maps."""
+    _WARP_CACHE.clear()
+
+
+def _get_bilinear_neighbours(
+    index: NDArray[np.intp],
+    fractions: NDArray[np.float32],
+    row_step: int,
+    col_step: int,
+) -> list[tuple[NDArray[np.intp], NDArray[np.float32]]]:
+    """Get the flat indices and weights of the 2x2 bilinear neighbourhood."""
+    row_weight, col_weight = fractions[..., 0], fractions[..., 1]
+    return [
+        (index, (1 - row_weight) * (1 - col_weight)),
+        (index + col_step, (1 - row_weight) * col_weight),
+        (index + row_step, row_weight * (1 - col_weight)),
+        (index + row_step + col_step, row_weight * col_weight),
+    ]
+
+
+def _interpolate(
+    flat: NDArray[Any],
+    neighbours: list[tuple[NDArray[np.intp], NDArray[np.float32]]],
+    dtype: np.dtype[Any],
+) -> NDArray[Any]:
+    """Weighted sum of gathered neighbours, a plain gather for a single one."""
+    if len(neighbours) == 1:
+        return flat[neighbours[0][0]]
+    # Broadcast weights over trailing channels
+    expand = (..., *(None,) * (flat.ndim - 1))
+    (first, first_weight), *others = neighbours
+    block = flat[first] * first_weight[expand]
+    for neighbour, weight in others:
+        block += flat[neighbour] * weight[expand]
+    if np.issubdtype(dtype, np.integer):
+        np.rint(block, out=block)
+    return block
+
+
+def _gather(
+    arrays: list[NDArray[Any]],
+    warp_map: WarpMap,
+    method: str,
+    fill: float,
+    masks: list[NDArray[np.uint8]] | None = None,
+) -> tuple[list[NDArray[Any]], list[NDArray[np.uint8]]]:
+    """Resample arrays and masks on the same grid in one pass over the map.
+
+    With bilinear resampling, masks take the minimum over the neighbours with
+    a non-zero weight instead of their weighted mean.
+    """
+    if method not in REPROJECT_METHODS:
+        msg = f"Unknown method {method!r}, expected one of {REPROJECT_METHODS}"
+        raise ValueError(msg)
+    masks = masks or []
+    for array in [*arrays, *masks]:
+        if array.shape[:2] != warp_map.source_shape:
+            msg = (
+                f"Array shape {array.shape[:2]} does not match source grid "
+                f"{warp_map.source_shape}"
+            )
+            raise ValueError(msg)
+
+    height, width = warp_map.source_shape
+    row_step = width if height > 1 else 0
+    col_step = 1 if width > 1 else 0
+    flat_arrays = [array.reshape(height * width, *array.shape[2:]) for array in arrays]
+    flat_masks = [mask.reshape(height * width) for mask in masks]
+    outputs = [
+        np.empty((*warp_map.shape, *array.shape[2:]), dtype=array.dtype)
+        for array in arrays
+    ]
+    mask_outputs = [np.empty(warp_map.shape, dtype=np.uint8) for _ in masks]
+
+    def kernel(rows: slice) -> None:
+        lookup = warp_map.nearest if method == "nearest" else warp_map.corner
+        index = lookup[rows]
+        outside = index < 0
+        index = np.where(outside, 0, index)
+        if method == "nearest":
+            neighbours = [(index, np.ones(index.shape, dtype=np.float32))]
+        else:
+            neighbours = _get_bilinear_neighbours(
+                index, warp_map.weights[rows], row_step, col_step
+            )
+
+        for flat, output in zip(flat_arrays, outputs, strict=True):
+            output[rows] = _interpolate(flat, neighbours, output.dtype)
+            output[rows][outside] = fill
+
+        if not flat_masks:
+            return
+        # Zero-weight neighbours point to the nearest pixel, which always
+        # contributes, so they never invalidate the target pixel
+        nearest = np.where(outside, 0, warp_map.nearest[rows])
+        mask_neighbours = [
+            np.where(weight > 0, neighbour, nearest) for neighbour, weight in neighbours
+        ]
+        for flat_mask, mask_output in zip(flat_masks, mask_outputs, strict=True):
+            block = mask_output[rows]
+            block[...] = flat_mask[mask_neighbours[0]]
+            for neighbour in mask_neighbours[1:]:
+                np.minimum(block, flat_mask[neighbour], out=block)
+            block[outside] = 0
+
+    run_row_blocks(kernel, warp_map.shape)
+    return outputs, mask_outputs
+
+
+def reproject_array(
+    data: NDArray[Any],
+    warp_map: WarpMap,
+    method: str = "nearest",
+    fill: float = 0,
+) -> NDArray[Any]:
+    """Reproject an array with a precomputed warp map.
+
+    Parameters
+    ----------
+    data : NDArray[Any]
+        Band, index or image on the source grid, (H, W) or (H, W, C).
+    warp_map : WarpMap
+        Map from `get_warp_map`.
+    method : str
+        Resampling method in REPROJECT_METHODS, by default 'nearest'.
+    fill : float
+        Value of target pixels outside the source grid, by default 0.
+
+    Returns
+    -------
+    NDArray[Any]
+        Reprojected array (H_t, W_t) or (H_t, W_t, C) with the input dtype.
+
+    Raises
+    ------
+    ValueError
+        If the method is unknown or the array is not on the source grid.
+
+    """
+    return _gather([data], warp_map, method, fill)[0][0]
+
+
+def reproject_scene(
+    bands: dict[str, NDArray[np.float32]],
+    masks: dict[str, NDArray[np.uint8]],
+    warp_map: WarpMap,
+    method: str = "nearest",
+) -> tuple[dict[str, NDArray[np.float32]], dict[str, NDArray[np.uint8]]]:
+    """Reproject all bands and masks of a scene with a precomputed warp map.
+
+    All arrays are resampled in one pass over the map, in parallel row
+    blocks. With bilinear resampling, a target pixel is valid only if its
+    four source neighbours are valid.
+
+    Parameters
+    ----------
+    bands : dict[str, NDArray[np.float32]]
+        Dictionary of band data arrays, as returned by `load_all_bands`.
+    masks : dict[str, NDArray[np.uint8]]
+        Dictionary of mask arrays where 255=valid, 0=invalid.
+    warp_map : WarpMap
+        Map from `get_warp_map`.
+    method : str
+        Band resampling method in REPROJECT_METHODS, by default 'nearest'.
+
+    Returns
+    -------
+    tuple[dict[str, NDArray[np.float32]], dict[str, NDArray[np.uint8]]]
+        Dictionary of reprojected band arrays and dictionary of reprojected
+        mask arrays, outside pixels masked.
+
+    """
+    band_ids = list(bands)
+    reprojected, reprojected_masks = _gather(
+        [bands[band_id] for band_id in band_ids],
+        warp_map,
+        method,
+        0,
+        masks=[masks[band_id] for band_id in band_ids],
+    )
+    return (
+        dict(zip(band_ids, reprojected, strict=True)),
+        dict(zip(band_ids, reprojected_masks, strict=True)),
+    )
@@ -0,0 +1,226 @@
+"""Shared-memory scene handoff for multiprocessing workers."""
+
+import weakref
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+@dataclass(frozen=True)
+class SharedArrayHandle:
+    """Picklable reference to an array published in shared memory.
+
+    Attributes
+    ----------
+    name : str
+        Shared memory segment name.
+    shape : tuple[int, ...]
+        Array shape.
+    dtype : str
+        Array dtype string (e.g., '<f4').
+
+    """
+
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+
+
+@dataclass(frozen=True)
+class SharedSceneHandle:
+    """Picklable reference to a scene published in shared memory.
+
+    Attributes
+    ----------
+    bands : SharedArrayHandle
+        Band cube (B, H, W) in band_ids order.
+    masks : SharedArrayHandle
+        Mask cube (B, H, W) in band_ids order.
+    band_ids : tuple[str, ...]
+        Band identifiers of the cube planes.
+
+    """
+
+    bands: SharedArrayHandle
+    masks: SharedArrayHandle
+    band_ids: tuple[str, ...]
+
+
+class _AttachedSegment:
+    """Buffer owner keeping an attached segment mapped while views exist.
+
+    Arrays built on this object reference it as their base, so the mapping
+    is closed only once the last view is released instead of being unmapped
+    under live views.
+    """
+
+    def __init__(self, name: str) -> None:
+        self._shm = SharedMemory(name=name, track=False)
+        weakref.finalize(self, self._shm.close)
+
+    def __buffer__(self, flags: int) -> memoryview:
+        buffer = self._shm.buf
+        if buffer is None:
+            msg = f"Shared memory segment {self._shm.name} is closed"
+            raise BufferError(msg)
+        return buffer.__buffer__(flags)
+
+
+@contextmanager
+def _create_segment(
+    shape: tuple[int, ...], dtype: np.dtype[Any]
+) -> Iterator[tuple[SharedMemory, SharedArrayHandle]]:
+    """Create a shared memory segment, unlinked when the context exits."""
+    nbytes = int(np.prod(shape)) * dtype.itemsize
+    # Zero-size segments are not allowed
+    shm = SharedMemory(create=True, size=max(nbytes, 1))
+    try:
+        yield shm, SharedArrayHandle(shm.name, shape, dtype.str)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+@contextmanager
+def share_array(array: NDArray[Any]) -> Iterator[SharedArrayHandle]:
+    """Publish a copy of an array in shared memory.
+
+    The segment is unlinked when the context exits, workers must be done
+    with it by then.
+
+    Parameters
+    ----------
+    array : NDArray[Any]
+        Array to publish, e.g. a band cube (T, B, H, W).
+
+    Yields
+    ------
+    SharedArrayHandle
+        Small picklable handle to pass to workers.
+
+    """
+    with _create_segment(array.shape, array.dtype) as (shm, handle):
+        shared: NDArray[Any] = np.ndarray(array.shape, array.dtype, buffer=shm.buf)
+        shared[...] = array
+        del shared
+        yield handle
+
+
+@contextmanager
+def attach_array(
+    handle: SharedArrayHandle, writable: bool = False
+) -> Iterator[NDArray[Any]]:
+    """Attach a zero-copy view of an array published in shared memory.
+
+    Parameters
+    ----------
+    handle : SharedArrayHandle
+        Handle returned by `share_array`.
+    writable : bool
+        Whether the view may be modified, by default False.
+
+    Yields
+    ------
+    NDArray[Any]
+        View on the shared segment. The segment stays mapped in this process
+        while views of it are alive.
+
+    """
+    array: NDArray[Any] = np.ndarray(
+        handle.shape, np.dtype(handle.dtype), buffer=_AttachedSegment(handle.name)
+    )
+    array.flags.writeable = writable
+    try:
+        yield array
+    finally:
+        # Unmapped right away unless the caller still holds views
+        del array
+
+
+@contextmanager
+def share_scene(
+    bands: dict[str, NDArray[np.float32]],
+    masks: dict[str, NDArray[np.uint8]],
+) -> Iterator[SharedSceneHandle]:
+    """Publish a loaded scene in shared memory.
+
+    Bands and masks are copied once into two (B, H, W) cubes. The band cube
+    keeps the common dtype of the bands, float32 for `load_all_bands`
+    scenes. The segments are unlinked when the context exits, workers must
+    be done with them by then.
+
+    Parameters
+    ----------
+    bands : dict[str, NDArray[np.float32]]
+        Dictionary of band data arrays, as returned by `load_all_bands`.
+    masks : dict[str, NDArray[np.uint8]]
+        Dictionary of mask arrays, as returned by `load_all_bands`.
+
+    Yields
+    ------
+    SharedSceneHandle
+        Small picklable handle to pass to workers.
+
+    Raises
+    ------
+    ValueError
+        If the scene has no bands.
+
+    """
+    if not bands:
+        msg = "Cannot share a scene without bands"
+        raise ValueError(msg)
+
+    band_ids = tuple(bands)
+    shape = (len(band_ids), *bands[band_ids[0]].shape)
+    dtype = np.result_type(*bands.values())
+    with (
+        _create_segment(shape, dtype) as (band_shm, band_handle),
+        _create_segment(shape, np.dtype(np.uint8)) as (mask_shm, mask_handle),
+    ):
+        band_cube: NDArray[Any] = np.ndarray(shape, dtype, buffer=band_shm.buf)
+        mask_cube: NDArray[np.uint8] = np.ndarray(shape, np.uint8, buffer=mask_shm.buf)
+        for index, band_id in enumerate(band_ids):
+            band_cube[index] = bands[band_id]
+            mask_cube[index] = masks[band_id]
+        del band_cube, mask_cube
+        yield SharedSceneHandle(band_handle, mask_handle, band_ids)
+
+
+@contextmanager
+def attach_scene(
+    handle: SharedSceneHandle,
+) -> Iterator[tuple[dict[str, NDArray[np.float32]], dict[str, NDArray[np.uint8]]]]:
+    """Attach zero-copy read-only views of a scene published in shared memory.
+
+    Parameters
+    ----------
+    handle : SharedSceneHandle
+        Handle returned by `share_scene`.
+
+    Yields
+    ------
+    tuple[dict[str, NDArray[np.float32]], dict[str, NDArray[np.uint8]]]
+        Dictionary of band data arrays and dictionary of mask arrays, usable
+        with every `calculate_*` function. Both are emptied when the context
+        exits.
+
+    """
+    with (
+        attach_array(handle.bands) as band_cube,
+        attach_array(handle.masks) as mask_cube,
+    ):
+        bands = dict(zip(handle.band_ids, band_cube, strict=True))
+        masks = dict(zip(handle.band_ids, mask_cube, strict=True))
+        try:
+            yield bands, masks
+        finally:
+            # Drop views so the segments can be unmapped right away
+            bands.clear()
+            masks.clear()
+            del band_cube, mask_cube
@@ -0,0 +1,111 @@
+"""Compact valid-pixel representation for heavily masked scenes."""
+
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+@dataclass(frozen=True)
+class SparseIndex:
+    """Positions of the stored pixels of a compressed scene.
+
+    Attributes
+    ----------
+    shape : tuple[int, int]
+        Grid shape (H, W) of the original scene.
+    packed : NDArray[np.uint8]
+        Bit-packed row-major footprint of the stored pixels, 1 bit per pixel.
+    count : int
+        Number of stored pixels (N).
+
+    """
+
+    shape: tuple[int, int]
+    packed: NDArray[np.uint8]
+    count: int
+
+    @property
+    def footprint(self) -> NDArray[np.bool_]:
+        """Boolean grid (H, W) of the stored pixels."""
+        size = self.shape[0] * self.shape[1]
+        return np.unpackbits(self.packed, count=size).view(bool).reshape(self.shape)
+
+
+def compress_scene(
+    bands: dict[str, NDArray[np.float32]],
+    masks: dict[str, NDArray[np.uint8]],
+) -> tuple[dict[str, NDArray[np.float32]], dict[str, NDArray[np.uint8]], SparseIndex]:
+    """Keep only pixels valid in at least one band, as flat per-band arrays.
+
+    The flat bands and masks have the same layout as `load_all_bands` output
+    with (N,) arrays instead of (H, W), so every `calculate_*` function,
+    `normalize_band` and `create_rgb_composite` run on them directly with
+    cost proportional to valid pixels. Results are scattered back to the
+    grid with `expand` for rendering or writing.
+
+    Parameters
+    ----------
+    bands : dict[str, NDArray[np.float32]]
+        Dictionary of band data arrays, as returned by `load_all_bands`.
+    masks : dict[str, NDArray[np.uint8]]
+        Dictionary of mask arrays where 255=valid, 0=invalid.
+
+    Returns
+    -------
+    tuple[dict[str, NDArray[np.float32]], dict[str, NDArray[np.uint8]], SparseIndex]
+        Dictionary of flat band arrays (N,), dictionary of flat mask arrays
+        (N,) and the index of the stored pixel positions.
+
+    """
+    shape = next(iter(masks.values())).shape
+    footprint = np.zeros(shape[0] * shape[1], dtype=bool)
+    for mask in masks.values():
+        footprint |= mask.ravel() == 255
+
+    flat_bands = {band_id: data.ravel()[footprint] for band_id, data in bands.items()}
+    flat_masks = {band_id: mask.ravel()[footprint] for band_id, mask in masks.items()}
+    index = SparseIndex(
+        shape=(shape[0], shape[1]),
+        packed=np.packbits(footprint),
+        count=int(np.count_nonzero(footprint)),
+    )
+    return flat_bands, flat_masks, index
+
+
+def expand(
+    values: NDArray[np.generic],
+    index: SparseIndex,
+    fill: float = 0,
+) -> NDArray[np.generic]:
+    """Scatter flat values back to the full grid.
+
+    Parameters
+    ----------
+    values : NDArray[np.generic]
+        Flat values (N,) or flat pixels with trailing channels (N, C), e.g.
+        an index from `calculate_ndvi` or an RGB composite.
+    index : SparseIndex
+        Index returned by `compress_scene`.
+    fill : float
+        Value of pixels outside the stored footprint, by default 0 which
+        matches masked pixels of the dense functions.
+
+    Returns
+    -------
+    NDArray[np.generic]
+        Grid (H, W) or (H, W, C) with the values dtype.
+
+    Raises
+    ------
+    ValueError
+        If the number of values does not match the index.
+
+    """
+    if values.shape[0] != index.count:
+        msg = f"Expected {index.count} values, got {values.shape[0]}"
+        raise ValueError(msg)
+
+    grid = np.full((*index.shape, *values.shape[1:]), fill, dtype=values.dtype)
+    grid[index.footprint] = values
+    return grid
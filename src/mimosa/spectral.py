@@ -0,0 +1,199 @@
+"""Spectral signature matching over the Sentinel-2 band cube."""
+
+from collections.abc import Iterator
+
+import numpy as np
+from numpy.typing import NDArray
+
+from mimosa.constants import SENTINEL2_BANDS
+
+# Approximate surface reflectance of reference land covers around
+# Mandelieu-la-Napoule, in SENTINEL2_BANDS order (B01 ... B12)
+SPECTRAL_SIGNATURES: dict[str, tuple[float, ...]] = {
+    "Mimosa in flower": (
+        0.04, 0.05, 0.12, 0.14, 0.20, 0.28, 0.32, 0.36, 0.37, 0.37, 0.24, 0.14,
+    ),
+    "Pine": (
+        0.02, 0.02, 0.04, 0.02, 0.07, 0.18, 0.22, 0.24, 0.25, 0.25, 0.12, 0.05,
+    ),
+    "Maquis": (
+        0.03, 0.04, 0.07, 0.06, 0.11, 0.20, 0.24, 0.26, 0.27, 0.27, 0.20, 0.11,
+    ),
+    "Urban": (
+        0.10, 0.11, 0.13, 0.15, 0.17, 0.19, 0.20, 0.22, 0.22, 0.22, 0.25, 0.22,
+    ),
+    "Water": (
+        0.06, 0.06, 0.05, 0.03, 0.02, 0.015, 0.012, 0.01, 0.01, 0.008, 0.005, 0.003,
+    ),
+}  # fmt: skip
+
+# Supported scoring methods
+SPECTRAL_METHODS = [
+    "spectral_angle",
+    "matched_filter",
+    "euclidean",
+]
+
+# Default number of valid pixels scored per chunk
+SPECTRAL_CHUNK_PIXELS = 65536
+
+
+def _iter_pixel_chunks(
+    bands: dict[str, NDArray[np.float32]],
+    indices: NDArray[np.intp],
+    chunk_pixels: int,
+) -> Iterator[tuple[slice, NDArray[np.float32]]]:
+    """Yield (chunk slice, band-major pixel matrix (B, n)) for valid pixels."""
+    band_ids = list(SENTINEL2_BANDS)
+    flat_bands = [bands[band_id].ravel() for band_id in band_ids]
+    for start in range(0, len(indices), chunk_pixels):
+        chunk = slice(start, min(start + chunk_pixels, len(indices)))
+        pixels = np.empty((len(band_ids), chunk.stop - start), dtype=np.float32)
+        for row, flat in zip(pixels, flat_bands, strict=True):
+            np.take(flat, indices[chunk], out=row)
+        yield chunk, pixels
+
+
+def _matched_filter_weights(
+    bands: dict[str, NDArray[np.float32]],
+    indices: NDArray[np.intp],
+    targets: NDArray[np.float32],
+    chunk_pixels: int,
+) -> tuple[NDArray[np.float32], NDArray[np.float32]]:
+    """Compute matched filter weights (K, B) and offsets (K,) from valid pixels."""
+    n_bands = targets.shape[1]
+    total = np.zeros(n_bands)
+    gram = np.zeros((n_bands, n_bands))
+    for _, pixels in _iter_pixel_chunks(bands, indices, chunk_pixels):
+        total += pixels.sum(axis=1, dtype=np.float64)
+        gram += pixels.astype(np.float64) @ pixels.T.astype(np.float64)
+
+    # Background mean and covariance, lightly regularized for invertibility
+    mean = total / len(indices)
+    covariance = gram / len(indices) - np.outer(mean, mean)
+    covariance += np.eye(n_bands) * max(np.trace(covariance) / n_bands, 1.0) * 1e-6
+
+    directions = targets - mean
+    weights = np.linalg.solve(covariance, directions.T).T
+    weights /= np.einsum("kb,kb->k", weights, directions)[:, None]
+    offsets = weights @ mean
+    return weights.astype(np.float32), offsets.astype(np.float32)
+
+
+def _get_targets(
+    signatures: dict[str, tuple[float, ...]], n_bands: int
+) -> NDArray[np.float32]:
+    """Validate reference signatures and stack them into a (K, B) matrix."""
+    # Class IDs 1-255 must fit the uint8 class map
+    if not 0 < len(signatures) <= 255:
+        msg = f"Expected 1 to 255 signatures, got {len(signatures)}"
+        raise ValueError(msg)
+    for name, signature in signatures.items():
+        if len(signature) != n_bands:
+            msg = f"Signature {name!r} has {len(signature)} values, expected {n_bands}"
+            raise ValueError(msg)
+    return np.array(list(signatures.values()), dtype=np.float32)
+
+
+def compute_spectral_scores(
+    bands: dict[str, NDArray[np.float32]],
+    masks: dict[str, NDArray[np.uint8]],
+    signatures: dict[str, tuple[float, ...]] | None = None,
+    method: str = "spectral_angle",
+    chunk_pixels: int = SPECTRAL_CHUNK_PIXELS,
+) -> tuple[dict[str, NDArray[np.float32]], NDArray[np.uint8]]:
+    """Score every pixel spectrum against a library of reference signatures.
+
+    Valid pixels (valid in all 12 bands) are gathered in chunks into a
+    (bands x pixels) matrix and scored against all signatures at once with a
+    single matrix product.
+
+    Parameters
+    ----------
+    bands : dict[str, NDArray[np.float32]]
+        Dictionary of band data arrays for all SENTINEL2_BANDS.
+    masks : dict[str, NDArray[np.uint8]]
+        Dictionary of mask arrays where 255=valid, 0=invalid.
+    signatures : dict[str, tuple[float, ...]] | None
+        Reference spectra in SENTINEL2_BANDS order, by default
+        SPECTRAL_SIGNATURES.
+    method : str
+        Scoring method from SPECTRAL_METHODS, by default 'spectral_angle'.
+    chunk_pixels : int
+        Number of valid pixels scored per chunk, by default
+        SPECTRAL_CHUNK_PIXELS.
+
+    Returns
+    -------
+    tuple[dict[str, NDArray[np.float32]], NDArray[np.uint8]]
+        Score raster (H, W) per signature name with masked pixels set to 0,
+        and class map (H, W) holding 1 + the index of the best matching
+        signature, 0 for masked pixels.
+
+    Raises
+    ------
+    ValueError
+        If the method is unknown, there are not 1 to 255 signatures or a
+        signature does not have one value per band.
+
+    Notes
+    -----
+    Scoring methods:
+    - spectral_angle: angle in radians between spectra, lower is better.
+    - matched_filter: background-whitened projection onto each signature,
+      1 for an exact match and 0 for the background mean, higher is better.
+    - euclidean: Euclidean distance between spectra, lower is better.
+
+    """
+    if method not in SPECTRAL_METHODS:
+        msg = f"Unknown spectral method {method!r}, expected one of {SPECTRAL_METHODS}"
+        raise ValueError(msg)
+    if signatures is None:
+        signatures = SPECTRAL_SIGNATURES
+
+    band_ids = list(SENTINEL2_BANDS)
+    targets = _get_targets(signatures, len(band_ids))
+
+    # Pixel is valid only if valid in all bands
+    shape = bands[band_ids[0]].shape
+    combined_mask = np.ones(shape, dtype=bool)
+    for band_id in band_ids:
+        combined_mask &= masks[band_id] == 255
+    indices = np.flatnonzero(combined_mask)
+
+    scores = np.zeros((len(targets), combined_mask.size), dtype=np.float32)
+    class_map = np.zeros(combined_mask.size, dtype=np.uint8)
+    # Background statistics need at least one valid pixel
+    if method == "matched_filter" and len(indices) > 0:
+        weights, offsets = _matched_filter_weights(
+            bands, indices, targets, chunk_pixels
+        )
+    target_norms = np.linalg.norm(targets, axis=1)
+
+    for chunk, pixels in _iter_pixel_chunks(bands, indices, chunk_pixels):
+        if method == "matched_filter":
+            chunk_scores = weights @ pixels - offsets[:, None]
+            best = np.argmax(chunk_scores, axis=0)
+        else:
+            products = targets @ pixels  # (K, n)
+            pixel_norms = np.sqrt(np.einsum("bn,bn->n", pixels, pixels))
+            if method == "spectral_angle":
+                norms = np.outer(target_norms, pixel_norms)
+                cosine = np.divide(
+                    products, norms, out=np.zeros_like(products), where=norms != 0
+                )
+                chunk_scores = np.arccos(np.clip(cosine, -1, 1))
+            else:
+                squared = (
+                    pixel_norms[None, :] ** 2
+                    - 2 * products
+                    + target_norms[:, None] ** 2
+                )
+                chunk_scores = np.sqrt(np.maximum(squared, 0))
+            best = np.argmin(chunk_scores, axis=0)
+
+        scores[:, indices[chunk]] = chunk_scores
+        class_map[indices[chunk]] = best + 1
+
+    score_rasters = dict(zip(signatures, scores.reshape(-1, *shape), strict=True))
+    return score_rasters, class_map.reshape(shape)
@@ -0,0 +1,194 @@
+"""Zonal statistics over label rasters for polygons and zone grids."""
+
+import hashlib
+import json
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+# Label rasters keyed by (zones digest, grid, all_touched)
+_ZONE_CACHE: dict[tuple[Any, ...], NDArray[np.int32]] = {}
+
+
+def rasterize_zones(
+    zones: Sequence[Any],
+    reference: dict[str, Any],
+    all_touched: bool = False,
+) -> NDArray[np.int32]:
+    """Rasterize zone geometries into a label raster cached per grid.
+
+    Parameters
+    ----------
+    zones : Sequence[Any]
+        GeoJSON-like geometry mappings or objects exposing
+        `__geo_interface__`, in the CRS of the reference grid.
+    reference : dict[str, Any]
+        Reference profile providing 'width', 'height', 'crs' and 'transform',
+        for example from `load_band_profile`.
+    all_touched : bool
+        Whether to label every pixel touched by a geometry instead of only
+        pixels whose center is inside, by default False.
+
+    Returns
+    -------
+    NDArray[np.int32]
+        Read-only label raster (H, W) where zone i (0-based) has label i + 1
+        and 0 is outside every zone. Overlapping zones keep the last label.
+
+    """
+    # Deferred so zonal statistics on existing labels do not load rasterio
+    from rasterio.features import rasterize
+
+    geometries = [getattr(zone, "__geo_interface__", zone) for zone in zones]
+    digest = hashlib.sha256(
+        json.dumps(geometries, sort_keys=True, default=list).encode()
+    ).hexdigest()
+    shape = (reference["height"], reference["width"])
+    key = (
+        digest,
+        str(reference.get("crs")),
+        tuple(reference["transform"]),
+        shape,
+        all_touched,
+    )
+
+    if key not in _ZONE_CACHE:
+        labels = rasterize(
+            ((geometry, label) for label, geometry in enumerate(geometries, 1)),
+            out_shape=shape,
+            transform=reference["transform"],
+            fill=0,
+            all_touched=all_touched,
+            dtype="int32",
+        )
+        labels.flags.writeable = False
+        _ZONE_CACHE[key] = labels
+    return _ZONE_CACHE[key]
+
+
+def clear_zone_cache() -> None:
+    """Drop all cached label rasters."""
+    _ZONE_CACHE.clear()
+
+
+def compute_zonal_stats(
+    values: NDArray[Any],
+    labels: NDArray[np.integer[Any]],
+    mask: NDArray[np.uint8] | None = None,
+    n_zones: int | None = None,
+    bins: NDArray[np.floating[Any]] | None = None,
+) -> dict[str, NDArray[Any]]:
+    """Compute per-zone statistics for all zones in a single pass.
+
+    Zone pixels are grouped once by sorting the label raster, then every
+    statistic is a single `ufunc.reduceat` or `np.bincount` over the grouped
+    pixels, for all dates at once.
+
+    Parameters
+    ----------
+    values : NDArray[Any]
+        Band or index raster (H, W), or a stack of dates (T, H, W).
+    labels : NDArray[np.integer[Any]]
+        Label raster (H, W) where zone i (0-based) has label i + 1 and 0 is
+        ignored, e.g. from `rasterize_zones`.
+    mask : NDArray[np.uint8] | None
+        Optional mask (H, W) or (T, H, W) where 255=valid, 0=invalid. Invalid
+        pixels are excluded from every statistic.
+    n_zones : int | None
+        Number of zones, by default the maximum label.
+    bins : NDArray[np.floating[Any]] | None
+        Optional monotonically increasing histogram bin edges, same
+        convention as `np.histogram`.
+
+    Returns
+    -------
+    dict[str, NDArray[Any]]
+        'count', 'sum', 'mean', 'min' and 'max' arrays of shape (Z,), or
+        (T, Z) for stacked values, plus 'histogram' of shape (Z, n_bins) or
+        (T, Z, n_bins) if bins are given. Zones without valid pixels have a
+        count of 0 and NaN mean, min and max.
+
+    Raises
+    ------
+    ValueError
+        If the values or mask shape does not match the label raster.
+
+    """
+    if values.shape[-2:] != labels.shape:
+        msg = f"Values shape {values.shape} does not match labels {labels.shape}"
+        raise ValueError(msg)
+    if mask is not None and mask.shape not in (labels.shape, values.shape):
+        msg = (
+            f"Mask shape {mask.shape} must match labels {labels.shape} "
+            f"or values {values.shape}"
+        )
+        raise ValueError(msg)
+
+    batched = values.ndim == 3
+    stack = values.reshape(-1, labels.size)
+    n_dates = stack.shape[0]
+    if n_zones is None:
+        n_zones = int(labels.max(initial=0))
+
+    # Group zone pixels by label once (stable radix/timsort on labels)
+    flat_labels = labels.ravel()
+    pixels = np.flatnonzero((flat_labels > 0) & (flat_labels <= n_zones))
+    order = np.argsort(flat_labels[pixels], kind="stable")
+    pixels = pixels[order]
+    pixel_zones = flat_labels[pixels] - 1
+    zone_ids, starts = np.unique(pixel_zones, return_index=True)
+
+    grouped = stack[:, pixels]  # (T, M)
+    if mask is None:
+        valid = np.ones(grouped.shape, dtype=bool)
+    else:
+        valid = np.broadcast_to(
+            mask.reshape(-1, labels.size)[:, pixels] == 255, grouped.shape
+        )
+
+    count = np.zeros((n_dates, n_zones), dtype=np.int64)
+    total = np.zeros((n_dates, n_zones), dtype=np.float64)
+    minimum = np.full((n_dates, n_zones), np.nan)
+    maximum = np.full((n_dates, n_zones), np.nan)
+    if len(starts) > 0:
+        count[:, zone_ids] = np.add.reduceat(valid, starts, axis=1, dtype=np.int64)
+        total[:, zone_ids] = np.add.reduceat(
+            np.where(valid, grouped, 0), starts, axis=1, dtype=np.float64
+        )
+        minimum[:, zone_ids] = np.minimum.reduceat(
+            np.where(valid, grouped, np.inf), starts, axis=1
+        )
+        maximum[:, zone_ids] = np.maximum.reduceat(
+            np.where(valid, grouped, -np.inf), starts, axis=1
+        )
+    empty = count == 0
+    minimum[empty] = np.nan
+    maximum[empty] = np.nan
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(empty, np.nan, total / count)
+
+    stats = {
+        "count": count,
+        "sum": total,
+        "mean": mean,
+        "min": minimum,
+        "max": maximum,
+    }
+
+    if bins is not None:
+        n_bins = len(bins) - 1
+        bin_index = np.searchsorted(bins, grouped, side="right") - 1
+        # Right edge is inclusive for the last bin, as in np.histogram
+        bin_index[grouped == bins[-1]] = n_bins - 1
+        keep = valid & (bin_index >= 0) & (bin_index < n_bins)
+        date_index = np.broadcast_to(np.arange(n_dates)[:, None], grouped.shape)
+        flat_index = (date_index * n_zones + pixel_zones) * n_bins + bin_index
+        stats["histogram"] = np.bincount(
+            flat_index[keep], minlength=n_dates * n_zones * n_bins
+        ).reshape(n_dates, n_zones, n_bins)
+
+    if not batched:
+        stats = {name: stat[0] for name, stat in stats.items()}
+    return stats
@@ -0,0 +1,200 @@
+import os
+from datetime import datetime
+from functools import partial
+
+import numpy as np
+import pytest
+import rasterio
+from rasterio.transform import from_origin
+
+from mimosa.cache import (
+    ProductCache,
+    compute_index_visualization,
+    compute_product,
+    get_default_cache,
+    get_product_key,
+)
+from mimosa.composite import (
+    calculate_ndvi,
+    create_index_visualization,
+    create_rgb_composite,
+)
+from mimosa.constants import SENTINEL2_BANDS
+from mimosa.data import load_all_bands
+
+DATE = datetime(2025, 2, 14)  # noqa: DTZ001
+
+
+@pytest.fixture
+def band_data_dir(tmp_path):
+    data_dir = tmp_path / "data"
+    date_dir = data_dir / "2025-02-14-00_00_2025-02-14-23_59_Sentinel-2_L2A"
+    date_dir.mkdir(parents=True)
+    rng = np.random.default_rng(42)
+    for band_id in SENTINEL2_BANDS:
+        with rasterio.open(
+            date_dir / f"2025-02-14_{band_id}_(Raw).tiff",
+            "w",
+            driver="GTiff",
+            height=20,
+            width=30,
+            count=1,
+            dtype="float32",
+            crs="EPSG:32632",
+            transform=from_origin(330000, 4820000, 10, 10),
+        ) as dst:
+            dst.write(rng.random((1, 20, 30)).astype(np.float32))
+    return data_dir
+
+
+def _age(cache, key, seconds):
+    path = cache.cache_dir / f"{key}.npy"
+    mtime = path.stat().st_mtime - seconds
+    os.utime(path, (mtime, mtime))
+
+
+def test_product_cache_put_get(tmp_path):
+    cache = ProductCache(tmp_path / "cache")
+    array = np.arange(12, dtype=np.float32).reshape(3, 4)
+
+    assert cache.get("a") is None
+    stored = cache.put("a", array, function="f", params="{}")
+
+    assert isinstance(stored, np.memmap)
+    assert not stored.flags.writeable
+    assert np.array_equal(cache.get("a"), array)
+    [entry] = cache.entries()
+    assert entry.key == "a"
+    assert entry.function == "f"
+    assert entry.nbytes == cache.total_bytes()
+
+
+def test_product_cache_lru_eviction(tmp_path):
+    array = np.zeros(1000, dtype=np.float64)
+    cache = ProductCache(tmp_path / "cache", max_bytes=int(2.5 * array.nbytes))
+    cache.put("a", array)
+    _age(cache, "a", 30)
+    cache.put("b", array)
+    _age(cache, "b", 20)
+    # Reading "a" makes "b" the least recently used
+    cache.get("a")
+
+    cache.put("c", array)
+
+    assert {entry.key for entry in cache.entries()} == {"a", "c"}
+    assert cache.total_bytes() <= cache.max_bytes
+
+
+def test_product_cache_over_budget(tmp_path):
+    cache = ProductCache(tmp_path / "cache", max_bytes=10)
+    array = np.zeros(100)
+
+    assert cache.put("a", array) is array
+    assert cache.entries() == []
+
+
+def test_product_cache_purge(tmp_path):
+    cache = ProductCache(tmp_path / "cache")
+    cache.put("a", np.zeros(3), function="mimosa.composite.calculate_ndvi")
+    cache.put("b", np.zeros(3), function="mimosa.composite.calculate_ndwi")
+
+    assert cache.purge("calculate_ndvi") == 1
+    assert [entry.key for entry in cache.entries()] == ["b"]
+    assert cache.purge() == 1
+    assert cache.entries() == []
+
+
+def test_get_default_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("MIMOSA_CACHE_DIR", str(tmp_path / "env"))
+    monkeypatch.setenv("MIMOSA_CACHE_BYTES", "1000")
+
+    cache = get_default_cache()
+
+    assert cache.cache_dir == tmp_path / "env"
+    assert cache.cache_dir.is_dir()
+    assert cache.max_bytes == 1000
+
+
+def test_get_product_key(tmp_path):
+    path = tmp_path / "band.tiff"
+    path.write_bytes(b"0")
+
+    key = get_product_key([path], calculate_ndvi, {"clip": (2, 98)})
+
+    assert key == get_product_key([path], calculate_ndvi, {"clip": (2, 98)})
+    assert key != get_product_key([path], calculate_ndvi, {"clip": (1, 99)})
+    assert key != get_product_key([path], create_rgb_composite, {"clip": (2, 98)})
+    path.write_bytes(b"01")
+    assert key != get_product_key([path], calculate_ndvi, {"clip": (2, 98)})
+    with pytest.raises(TypeError, match="object"):
+        get_product_key([path], calculate_ndvi, {"x": object()})
+
+
+def test_get_product_key_callables(tmp_path):
+    path = tmp_path / "band.tiff"
+    path.write_bytes(b"0")
+
+    def nested(bands, masks):
+        return bands, masks
+
+    class Scaler:
+        def __call__(self, bands, masks):
+            return bands, masks
+
+    for function in [lambda *_: 1, nested, Scaler()]:
+        with pytest.raises(TypeError, match="cache key"):
+            get_product_key([path], function, {})
+
+    false_color = partial(create_rgb_composite, r_band="B08", g_band="B04")
+    key = get_product_key([path], false_color, {})
+    assert key == get_product_key(
+        [path], partial(create_rgb_composite, r_band="B08", g_band="B04"), {}
+    )
+    assert key != get_product_key(
+        [path], partial(create_rgb_composite, r_band="B04", g_band="B03"), {}
+    )
+
+
+def test_compute_product(band_data_dir, tmp_path, monkeypatch):
+    cache = ProductCache(tmp_path / "cache")
+    bands, masks = load_all_bands(band_data_dir, DATE)
+
+    ndvi = compute_product(band_data_dir, DATE, calculate_ndvi, cache=cache)
+    rgb = compute_product(
+        band_data_dir, DATE, create_rgb_composite, "B04", "B03", "B02", cache=cache
+    )
+
+    assert np.array_equal(ndvi, calculate_ndvi(bands, masks))
+    assert np.array_equal(rgb, create_rgb_composite(bands, masks, "B04", "B03", "B02"))
+    assert len(cache.entries()) == 2
+
+    # Hits do not load bands again
+    monkeypatch.setattr("mimosa.cache.load_all_bands", None)
+    cached = compute_product(band_data_dir, DATE, calculate_ndvi, cache=cache)
+    assert np.array_equal(cached, ndvi)
+    assert len(cache.entries()) == 2
+
+
+def test_compute_product_partial(band_data_dir, tmp_path):
+    cache = ProductCache(tmp_path / "cache")
+    false_color = partial(create_rgb_composite, r_band="B08", g_band="B04")
+
+    rgb = compute_product(band_data_dir, DATE, false_color, b_band="B03", cache=cache)
+
+    bands, masks = load_all_bands(band_data_dir, DATE)
+    assert np.array_equal(rgb, create_rgb_composite(bands, masks, "B08", "B04", "B03"))
+    [entry] = cache.entries()
+    assert entry.function == "mimosa.composite.create_rgb_composite"
+
+
+def test_compute_index_visualization(band_data_dir, tmp_path):
+    cache = ProductCache(tmp_path / "cache")
+
+    rgb = compute_index_visualization(band_data_dir, DATE, calculate_ndvi, cache=cache)
+
+    ndvi = compute_product(band_data_dir, DATE, calculate_ndvi, cache=cache)
+    assert np.array_equal(rgb, create_index_visualization(ndvi))
+    assert {entry.function.rpartition(".")[2] for entry in cache.entries()} == {
+        "calculate_ndvi",
+        "create_index_visualization",
+    }
@@ -0,0 +1,125 @@
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pytest
+import rasterio
+from rasterio.crs import CRS
+from rasterio.transform import from_origin
+from rasterio.windows import Window
+
+from mimosa.data import load_band_profile
+from mimosa.export import get_overview_factors, open_geotiff, write_geotiff
+
+DATA_DIR = Path(__file__).parent.parent / "analysis" / "data"
+
+
+@pytest.fixture
+def reference():
+    return {
+        "width": 300,
+        "height": 200,
+        "crs": CRS.from_epsg(32632),
+        "transform": from_origin(330000, 4820000, 10, 10),
+    }
+
+
+def test_get_overview_factors():
+    assert get_overview_factors((819, 1015)) == [2]
+    assert get_overview_factors((100, 100)) == []
+    assert get_overview_factors((4000, 3000), blocksize=256) == [2, 4, 8, 16]
+
+
+def test_write_geotiff_index(tmp_path, reference):
+    rng = np.random.default_rng(42)
+    data = rng.random((200, 300)).astype(np.float32)
+    mask = np.full((200, 300), 255, dtype=np.uint8)
+    mask[:10] = 0
+    path = tmp_path / "ndvi.tif"
+
+    write_geotiff(path, data, reference, mask=mask, blocksize=64)
+
+    with rasterio.open(path) as src:
+        assert src.crs == reference["crs"]
+        assert src.transform == reference["transform"]
+        assert src.dtypes == ("float32",)
+        assert src.block_shapes == [(64, 64)]
+        assert src.compression.value == "DEFLATE"
+        assert src.overviews(1) == [2, 4, 8]
+        assert np.array_equal(src.read(1), data)
+        assert np.array_equal(src.read_masks(1), mask)
+
+
+def test_write_geotiff_composite(tmp_path, reference):
+    rng = np.random.default_rng(42)
+    rgb = rng.integers(0, 256, (200, 300, 3), dtype=np.uint8)
+    path = tmp_path / "composite.tif"
+
+    write_geotiff(path, rgb, reference, blocksize=128)
+
+    with rasterio.open(path) as src:
+        assert src.count == 3
+        assert src.tags(ns="rio_overview")["resampling"] == "nearest"
+        assert np.array_equal(np.moveaxis(src.read(), 0, -1), rgb)
+
+
+@pytest.mark.parametrize("dtype", ["float16", "float64", "int16"])
+def test_write_geotiff_dtypes(tmp_path, reference, dtype):
+    data = (np.random.default_rng(42).random((200, 300)) * 100).astype(dtype)
+    path = tmp_path / "data.tif"
+
+    write_geotiff(path, data, reference)
+
+    with rasterio.open(path) as src:
+        assert src.dtypes == (dtype,)
+        assert np.array_equal(src.read(1), data)
+
+
+def test_write_geotiff_bool(tmp_path, reference):
+    data = np.random.default_rng(42).random((200, 300)) < 0.5
+    path = tmp_path / "flag.tif"
+
+    write_geotiff(path, data, reference)
+
+    with rasterio.open(path) as src:
+        assert src.dtypes == ("uint8",)
+        assert np.array_equal(src.read(1), np.where(data, 255, 0))
+    with (
+        pytest.raises(ValueError, match="bool"),
+        open_geotiff(path, reference, dtype=bool),
+    ):
+        pass
+
+
+def test_write_geotiff_invalid_arguments(tmp_path, reference):
+    with pytest.raises(ValueError, match="does not match"):
+        write_geotiff(tmp_path / "a.tif", np.zeros((10, 10)), reference)
+    with pytest.raises(ValueError, match="Unknown compression"):
+        write_geotiff(
+            tmp_path / "a.tif", np.zeros((200, 300)), reference, compress="lzma"
+        )
+
+
+def test_open_geotiff_incremental(tmp_path, reference):
+    path = tmp_path / "mask.tif"
+
+    with open_geotiff(path, reference, dtype=np.uint8, blocksize=64) as dst:
+        for row in range(0, 200, 64):
+            height = min(64, 200 - row)
+            block = np.full((height, 300), row // 64, dtype=np.uint8)
+            dst.write(block, 1, window=Window(0, row, 300, height))
+
+    with rasterio.open(path) as src:
+        data = src.read(1)
+        assert src.block_shapes == [(64, 64)]
+        assert data[0, 0] == 0
+        assert data[199, 0] == 3
+
+
+@pytest.mark.integration
+def test_load_band_profile():
+    profile = load_band_profile(DATA_DIR, datetime(2024, 12, 16))  # noqa: DTZ001
+
+    assert profile["width"] == 1015
+    assert profile["height"] == 819
+    assert profile["crs"] is not None
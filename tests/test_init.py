@@ -0,0 +1,61 @@
+import ast
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import mimosa
+
+
+def test_public_api_is_resolvable():
+    for name in mimosa.__all__:
+        assert getattr(mimosa, name) is not None
+    assert set(mimosa.__all__) <= set(dir(mimosa))
+
+
+def test_exports_match_type_checking_imports():
+    tree = ast.parse(Path(mimosa.__file__).read_text())
+    [type_checking] = [
+        node
+        for node in tree.body
+        if isinstance(node, ast.If) and ast.unparse(node.test) == "TYPE_CHECKING"
+    ]
+    imports = {
+        alias.name: node.module
+        for node in type_checking.body
+        if isinstance(node, ast.ImportFrom)
+        for alias in node.names
+    }
+
+    assert imports == mimosa._EXPORTS
+    assert mimosa.__all__ == sorted(imports)
+    assert len(mimosa.__all__) == sum(map(len, mimosa._LAZY_IMPORTS.values()))
+
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError, match="no attribute"):
+        _ = mimosa.not_a_function
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import mimosa",
+        "import mimosa.composite",
+        "from mimosa import calculate_ndvi, normalize_band, SENTINEL2_BANDS",
+        "from mimosa import compute_zonal_stats",
+    ],
+)
+def test_pure_numpy_api_does_not_import_rasterio(statement):
+    code = (
+        f"{statement}\n"
+        "import sys\n"
+        "import numpy as np\n"
+        "from mimosa.composite import calculate_ndvi\n"
+        "band = np.ones((2, 2), dtype=np.float32)\n"
+        "mask = np.full((2, 2), 255, dtype=np.uint8)\n"
+        "calculate_ndvi({'B08': band, 'B04': band}, {'B08': mask, 'B04': mask})\n"
+        "assert 'rasterio' not in sys.modules, 'rasterio was imported'\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)  # noqa: S603
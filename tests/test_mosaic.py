@@ -0,0 +1,99 @@
+import threading
+import warnings
+
+import numpy as np
+import pytest
+
+from mimosa import mosaic
+from mimosa.mosaic import create_temporal_mosaic
+from mimosa.parallel import set_num_threads
+
+
+def _make_scenes(n_dates, h, w, seed=42):
+    rng = np.random.default_rng(seed)
+    scenes = []
+    for _ in range(n_dates):
+        bands = {
+            "B04": rng.random((h, w)).astype(np.float32),
+            "B08": rng.random((h, w)).astype(np.float32),
+        }
+        masks = {
+            band_id: np.where(rng.random((h, w)) < 0.3, 0, 255).astype(np.uint8)
+            for band_id in bands
+        }
+        scenes.append((bands, masks))
+    return scenes
+
+
+def _reference(scenes, band_id, percentile):
+    stack = np.stack([bands[band_id] for bands, _ in scenes]).astype(np.float64)
+    valid = np.stack([masks[band_id] == 255 for _, masks in scenes])
+    stack[~valid] = np.nan
+    with warnings.catch_warnings():
+        # All-NaN pixels (no valid observation) warn
+        warnings.simplefilter("ignore", RuntimeWarning)
+        result = np.nanpercentile(stack, percentile, axis=0)
+    return np.nan_to_num(result, nan=0.0)
+
+
+@pytest.mark.parametrize("percentile", [0, 25, 50, 90, 100])
+def test_create_temporal_mosaic_matches_nanpercentile(percentile):
+    scenes = _make_scenes(5, 37, 23)
+
+    bands, masks = create_temporal_mosaic(scenes, percentile, chunk_rows=8)
+
+    for band_id in ("B04", "B08"):
+        assert bands[band_id].dtype == np.float32
+        assert masks[band_id].dtype == np.uint8
+        assert np.allclose(bands[band_id], _reference(scenes, band_id, percentile))
+
+
+def test_create_temporal_mosaic_masks():
+    scenes = _make_scenes(2, 4, 4)
+    for _, masks in scenes:
+        masks["B04"][0, 0] = 0
+    scenes[0][1]["B04"][1, 1] = 255
+    scenes[1][1]["B04"][1, 1] = 0
+
+    bands, masks = create_temporal_mosaic(scenes, band_ids=["B04"])
+
+    assert list(bands) == ["B04"]
+    assert masks["B04"][0, 0] == 0
+    assert bands["B04"][0, 0] == 0.0
+    assert masks["B04"][1, 1] == 255
+    assert bands["B04"][1, 1] == scenes[0][0]["B04"][1, 1]
+
+
+def test_create_temporal_mosaic_invalid_arguments():
+    with pytest.raises(ValueError, match="scene"):
+        create_temporal_mosaic([])
+    with pytest.raises(ValueError, match="Percentile"):
+        create_temporal_mosaic(_make_scenes(1, 2, 2), percentile=101)
+    with pytest.raises(ValueError, match="Chunk rows"):
+        create_temporal_mosaic(_make_scenes(1, 2, 2), chunk_rows=0)
+    scenes = _make_scenes(2, 4, 4) + _make_scenes(1, 4, 5)
+    with pytest.raises(ValueError, match="B04 shapes differ"):
+        create_temporal_mosaic(scenes)
+
+
+def test_create_temporal_mosaic_uses_shared_pool(monkeypatch):
+    scenes = _make_scenes(3, 20, 6)
+    set_num_threads(1)
+    serial, _ = create_temporal_mosaic(scenes, chunk_rows=4)
+    set_num_threads(4)
+    thread_names = set()
+    block = mosaic._percentile_block
+
+    def record(*args):
+        thread_names.add(threading.current_thread().name)
+        return block(*args)
+
+    monkeypatch.setattr(mosaic, "_percentile_block", record)
+    try:
+        threaded, _ = create_temporal_mosaic(scenes, chunk_rows=4)
+    finally:
+        set_num_threads(None)
+
+    assert all(name.startswith("mimosa") for name in thread_names)
+    for band_id in serial:
+        assert np.array_equal(serial[band_id], threaded[band_id])
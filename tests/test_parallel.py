@@ -0,0 +1,170 @@
+import numpy as np
+import pytest
+
+from mimosa import parallel
+from mimosa.composite import (
+    calculate_moisture_index,
+    calculate_ndsi,
+    calculate_ndvi,
+    calculate_ndwi,
+    create_rgb_composite,
+    get_percentile_range,
+    normalize_band,
+)
+from mimosa.parallel import (
+    get_num_threads,
+    get_row_blocks,
+    run_row_blocks,
+    run_tasks,
+    set_num_threads,
+)
+
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    # Force several row blocks and threading on small arrays
+    monkeypatch.setattr(parallel, "PARALLEL_BLOCK_PIXELS", 64)
+    monkeypatch.setattr(parallel, "PARALLEL_MIN_PIXELS", 0)
+    yield
+    set_num_threads(None)
+
+
+@pytest.fixture
+def scene():
+    h, w = 97, 53
+    rng = np.random.default_rng(42)
+    band_ids = ["B02", "B03", "B04", "B08", "B8A", "B11"]
+    bands = {band_id: rng.random((h, w)).astype(np.float32) for band_id in band_ids}
+    masks = {
+        band_id: np.where(rng.random((h, w)) < 0.1, 0, 255).astype(np.uint8)
+        for band_id in band_ids
+    }
+    # Zero denominators
+    bands["B08"][0, :5] = 0
+    bands["B04"][0, :5] = 0
+    return bands, masks
+
+
+def test_get_row_blocks(monkeypatch):
+    monkeypatch.setattr(parallel, "PARALLEL_BLOCK_PIXELS", 100)
+
+    blocks = get_row_blocks((25, 30))
+
+    assert blocks[0] == slice(0, 3)
+    assert blocks[-1] == slice(24, 25)
+    assert sum(block.stop - block.start for block in blocks) == 25
+
+
+def test_run_row_blocks_serial_below_threshold():
+    calls = []
+
+    run_row_blocks(calls.append, (10, 10))
+
+    assert calls == [slice(0, 10)]
+
+
+def test_run_row_blocks_covers_all_rows(small_blocks):  # noqa: ARG001
+    set_num_threads(4)
+    out = np.zeros((50, 10), dtype=np.int64)
+
+    def kernel(rows):
+        out[rows] += 1
+
+    run_row_blocks(kernel, out.shape)
+
+    assert np.all(out == 1)
+
+
+def test_run_row_blocks_propagates_errors(small_blocks):  # noqa: ARG001
+    set_num_threads(2)
+
+    def kernel(rows):
+        raise RuntimeError(rows)
+
+    with pytest.raises(RuntimeError):
+        run_row_blocks(kernel, (50, 10))
+
+
+def test_run_tasks(small_blocks):  # noqa: ARG001
+    results = [0] * 10
+
+    def square(index):
+        results[index] = index * index
+
+    for num_threads in (1, 4):
+        set_num_threads(num_threads)
+        run_tasks(square, range(10))
+        assert results == [index * index for index in range(10)]
+
+
+def test_set_num_threads():
+    set_num_threads(3)
+    assert get_num_threads() == 3
+    set_num_threads(None)
+    assert get_num_threads() >= 1
+    with pytest.raises(ValueError, match="at least 1"):
+        set_num_threads(0)
+
+
+@pytest.mark.parametrize(
+    "func",
+    [calculate_ndvi, calculate_moisture_index, calculate_ndwi, calculate_ndsi],
+)
+def test_index_threaded_matches_serial(small_blocks, scene, func):  # noqa: ARG001
+    bands, masks = scene
+    set_num_threads(1)
+    serial = func(bands, masks)
+    set_num_threads(4)
+    threaded = func(bands, masks)
+
+    assert np.array_equal(serial, threaded)
+
+
+def test_normalize_and_composite_threaded_match_serial(small_blocks, scene):  # noqa: ARG001
+    bands, masks = scene
+    set_num_threads(1)
+    serial_band = normalize_band(bands["B04"], masks["B04"])
+    serial_rgb = create_rgb_composite(bands, masks, "B04", "B03", "B02")
+    set_num_threads(4)
+    threaded_band = normalize_band(bands["B04"], masks["B04"])
+    threaded_rgb = create_rgb_composite(bands, masks, "B04", "B03", "B02")
+
+    assert np.array_equal(serial_band, threaded_band)
+    assert np.array_equal(serial_rgb, threaded_rgb)
+
+    # An unmasked NaN makes the percentile range NaN, normalizing to zeros
+    nan_band = bands["B04"].copy()
+    nan_band[3, 7] = np.nan
+    for num_threads in (1, 4):
+        set_num_threads(num_threads)
+        assert np.array_equal(normalize_band(nan_band), np.zeros_like(nan_band))
+
+
+@pytest.mark.parametrize("num_threads", [1, 4])
+def test_percentile_range_matches_numpy(small_blocks, scene, num_threads):  # noqa: ARG001
+    bands, masks = scene
+    set_num_threads(num_threads)
+    # Ties and a tiny value range exercise the histogram bins
+    rounded = np.round(bands["B08"], 2)
+    narrow = (1 + bands["B11"] * 1e-6).astype(np.float32)
+
+    for band, mask in [
+        (bands["B04"], masks["B04"]),
+        (rounded, masks["B08"]),
+        (narrow, None),
+    ]:
+        valid = band if mask is None else band[mask == 255]
+        for percentile_clip in [(2, 98), (0, 100), (33.3, 66.6)]:
+            expected = tuple(np.percentile(valid, percentile_clip))
+            assert get_percentile_range(band, mask, percentile_clip) == expected
+
+
+def test_percentile_range_edge_cases(small_blocks):  # noqa: ARG001
+    set_num_threads(4)
+    band = np.full((20, 10), 0.5, dtype=np.float32)
+    empty = np.zeros((20, 10), dtype=np.uint8)
+
+    assert get_percentile_range(band) == (0.5, 0.5)
+    assert get_percentile_range(band, empty) == (0.0, 1.0)
+    band[3, 4] = np.nan
+    assert np.isnan(get_percentile_range(band)).all()
@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from mimosa.phenology import fit_phenology, get_day_of_year, get_harmonic_design
+
+START = datetime(2024, 1, 5)  # noqa: DTZ001
+
+
+@pytest.fixture
+def seasonal_stack():
+    # Two years of acquisitions every 20 days
+    dates = [START + timedelta(days=20 * i) for i in range(36)]
+    days = get_day_of_year(dates)
+    peaks = np.array([[30.0, 60.0, 90.0], [200.0, 300.0, 350.0]])
+    angle = 2 * np.pi * (days[:, None, None] - peaks) / 365.25
+    stack = (0.3 + 0.2 * np.cos(angle)).astype(np.float32)
+    return dates, stack, peaks
+
+
+def _day_distance(a, b):
+    diff = np.abs(a - b) % 365
+    return np.minimum(diff, 365 - diff)
+
+
+def test_get_harmonic_design():
+    design = get_harmonic_design(np.array([1.0, 100.0]), n_harmonics=2)
+
+    assert design.shape == (2, 5)
+    assert np.all(design[:, 0] == 1)
+    assert design[0, 1] == pytest.approx(np.cos(2 * np.pi / 365.25))
+
+
+def test_fit_phenology_recovers_timing(seasonal_stack):
+    dates, stack, peaks = seasonal_stack
+
+    result = fit_phenology(dates, stack)
+
+    assert set(result) == {"onset", "peak", "end", "r_squared"}
+    assert result["peak"].shape == (2, 3)
+    assert result["peak"].dtype == np.float32
+    assert np.all(_day_distance(result["peak"], peaks) <= 1)
+    assert np.allclose(result["r_squared"], 1, atol=1e-6)
+
+
+def test_fit_phenology_pulse_width():
+    # Two years of acquisitions every 5 days
+    dates = [START + timedelta(days=5 * i) for i in range(146)]
+    days = get_day_of_year(dates)
+    widths = np.array([10.0, 40.0, 80.0])
+    distance = _day_distance(days[:, None], 45.0)
+    stack = np.exp(-0.5 * (distance / widths) ** 2)[:, None, :].astype(np.float32)
+
+    result = fit_phenology(dates, stack)
+
+    duration = ((result["end"] - result["onset"]) % 365)[0]
+    assert np.all(_day_distance(result["peak"][0], 45) <= 3)
+    # Wider bloom pulses last longer, unlike a single cosine (182 days)
+    assert np.all(np.diff(duration) > 0)
+    assert duration[0] < 91
+
+
+def test_fit_phenology_masks_and_chunks(seasonal_stack):
+    dates, stack, _ = seasonal_stack
+    rng = np.random.default_rng(42)
+    masks = np.where(rng.random(stack.shape) < 0.3, 0, 255).astype(np.uint8)
+    noisy = stack.copy()
+    noisy[masks == 0] = 0
+    # Pixel with too few valid observations
+    masks[2:, 0, 0] = 0
+    # NaN values are ignored
+    noisy[0, 1, 1] = np.nan
+
+    result = fit_phenology(dates, noisy, masks=masks)
+    chunked = fit_phenology(dates, noisy, masks=masks, chunk_pixels=4)
+
+    for name in result:
+        assert np.allclose(result[name], chunked[name], equal_nan=True)
+    assert np.isnan(result["peak"][0, 0])
+    assert np.isnan(result["r_squared"][0, 0])
+    assert np.allclose(result["r_squared"][~np.isnan(result["r_squared"])], 1)
+
+
+def test_fit_phenology_flat_series():
+    dates = [START + timedelta(days=30 * i) for i in range(6)]
+
+    result = fit_phenology(dates, np.ones((6, 2, 2), dtype=np.float32), n_harmonics=1)
+
+    assert np.isnan(result["peak"]).all()
+
+
+def test_fit_phenology_too_few_dates(seasonal_stack):
+    dates, stack, _ = seasonal_stack
+
+    with pytest.raises(ValueError, match="3 harmonics need at least 8 dates"):
+        fit_phenology(dates[:5], stack[:5], n_harmonics=3)
+    with pytest.raises(ValueError, match="1 harmonics need at least 4 dates"):
+        fit_phenology(dates[:3], stack[:3])
+    # Like the 5-date bundled dataset, the default falls back to one harmonic
+    default = fit_phenology(dates[:5], stack[:5])
+    single = fit_phenology(dates[:5], stack[:5], n_harmonics=1)
+    for name, result in default.items():
+        assert np.array_equal(result, single[name], equal_nan=True)
+    seven = fit_phenology(dates[:7], stack[:7])
+    assert np.array_equal(
+        seven["r_squared"],
+        fit_phenology(dates[:7], stack[:7], n_harmonics=2)["r_squared"],
+        equal_nan=True,
+    )
+
+
+def test_fit_phenology_date_mismatch(seasonal_stack):
+    dates, stack, _ = seasonal_stack
+
+    with pytest.raises(ValueError, match="Expected 36 dates"):
+        fit_phenology(dates[:-1], stack)
@@ -0,0 +1,169 @@
+import os
+import warnings
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pytest
+import rasterio
+from rasterio.errors import NotGeoreferencedWarning
+from rasterio.transform import from_origin
+
+from mimosa import quicklook
+from mimosa.quicklook import (
+    build_quicklook_pyramid,
+    clear_quicklook_cache,
+    find_quicklook_source,
+    load_quicklook,
+    select_quicklook_level,
+)
+
+DATA_DIR = Path(__file__).parent.parent / "analysis" / "data"
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    clear_quicklook_cache()
+    yield
+    clear_quicklook_cache()
+
+
+@pytest.fixture
+def tiff_data_dir(tmp_path):
+    date_dir = tmp_path / "2025-02-14-00_00_2025-02-14-23_59_Sentinel-2_L2A"
+    date_dir.mkdir()
+    rng = np.random.default_rng(42)
+    data = rng.random((3, 600, 800)).astype(np.float32)
+    with rasterio.open(
+        date_dir / "2025-02-14_True_color.tiff",
+        "w",
+        driver="GTiff",
+        height=600,
+        width=800,
+        count=3,
+        dtype="float32",
+        crs="EPSG:32632",
+        transform=from_origin(330000, 4820000, 10, 10),
+    ) as dst:
+        dst.write(data)
+    return tmp_path, data
+
+
+@pytest.fixture
+def jpeg_data_dir(tmp_path):
+    date_dir = tmp_path / "2025-02-14-00_00_2025-02-14-23_59_Sentinel-2_L2A"
+    date_dir.mkdir()
+    data = np.random.default_rng(42).integers(0, 256, (3, 60, 80), dtype=np.uint8)
+    # No CRS nor transform, like the downloaded JPEG quicklooks
+    with (
+        warnings.catch_warnings(category=NotGeoreferencedWarning, action="ignore"),
+        rasterio.open(
+            date_dir / "2025-02-14_True_color.jpg",
+            "w",
+            driver="JPEG",
+            height=60,
+            width=80,
+            count=3,
+            dtype="uint8",
+        ) as dst,
+    ):
+        dst.write(data)
+    return tmp_path
+
+
+def test_select_quicklook_level():
+    shape = (819, 1015)
+    assert select_quicklook_level(shape, 100) == 256
+    assert select_quicklook_level(shape, 256) == 256
+    assert select_quicklook_level(shape, 500) is None
+    assert select_quicklook_level(shape, None) is None
+    assert select_quicklook_level((2000, 3000), 500) == 1024
+
+
+def test_load_quicklook_from_tiff(tiff_data_dir):
+    data_dir, data = tiff_data_dir
+    date = datetime(2025, 2, 14)  # noqa: DTZ001
+
+    img, mask = load_quicklook(data_dir, date)
+    assert img.shape == (600, 800, 3)
+    assert img.dtype == np.uint8
+    assert mask.shape == (600, 800)
+    # Full level matches the plain float -> uint8 conversion
+    expected = np.transpose((data * 255).astype(np.uint8), (1, 2, 0))
+    assert np.array_equal(img, expected)
+
+    small, small_mask = load_quicklook(data_dir, date, display_size=200)
+    assert small.shape == (192, 256, 3)
+    assert small_mask.shape == (192, 256)
+
+
+def test_load_quicklook_is_cached(tiff_data_dir):
+    data_dir, _ = tiff_data_dir
+    date = datetime(2025, 2, 14)  # noqa: DTZ001
+
+    first, _ = load_quicklook(data_dir, date, display_size=256)
+    second, _ = load_quicklook(data_dir, date, display_size=128)
+    assert first is second
+    assert not first.flags.writeable
+
+
+def test_load_quicklook_rewritten_source(tiff_data_dir):
+    data_dir, _ = tiff_data_dir
+    date = datetime(2025, 2, 14)  # noqa: DTZ001
+    path = find_quicklook_source(data_dir, date)
+    load_quicklook(data_dir, date, display_size=256)
+    load_quicklook(data_dir, date)
+
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    load_quicklook(data_dir, date, display_size=256)
+
+    assert list(quicklook._QUICKLOOK_CACHE) == [(path, path.stat().st_mtime_ns, 256)]
+
+
+def test_quicklook_cache_is_bounded(tiff_data_dir, monkeypatch):
+    data_dir, _ = tiff_data_dir
+    date = datetime(2025, 2, 14)  # noqa: DTZ001
+    monkeypatch.setattr(quicklook, "QUICKLOOK_CACHE_ENTRIES", 2)
+
+    small, _ = load_quicklook(data_dir, date, display_size=256)
+    load_quicklook(data_dir, date)
+    # Reading the smallest level makes the full resolution the oldest entry
+    load_quicklook(data_dir, date, display_size=256)
+    load_quicklook(data_dir, date, display_size=512, levels=(256, 512))
+
+    assert [key[2] for key in quicklook._QUICKLOOK_CACHE] == [256, 512]
+    assert load_quicklook(data_dir, date, display_size=256)[0] is small
+
+
+def test_build_quicklook_pyramid(tiff_data_dir):
+    data_dir, _ = tiff_data_dir
+    pyramid = build_quicklook_pyramid(data_dir, datetime(2025, 2, 14))  # noqa: DTZ001
+
+    # 1024 is larger than the source and is served by the full level
+    assert list(pyramid) == [256]
+
+
+@pytest.mark.integration
+def test_find_quicklook_source_jpeg_fallback():
+    path = find_quicklook_source(DATA_DIR, datetime(2024, 12, 16))  # noqa: DTZ001
+    assert path.suffix == ".jpg"
+
+
+def test_load_quicklook_jpeg_without_georeference(jpeg_data_dir):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        img, mask = load_quicklook(jpeg_data_dir, datetime(2025, 2, 14))  # noqa: DTZ001
+
+    assert img.shape == (60, 80, 3)
+    assert mask.shape == (60, 80)
+
+
+@pytest.mark.integration
+def test_load_quicklook_jpeg():
+    img, mask = load_quicklook(DATA_DIR, datetime(2024, 12, 16), display_size=256)  # noqa: DTZ001
+
+    assert max(img.shape[:2]) == 256
+    assert img.shape[2] == 3
+    assert img.dtype == np.uint8
+    assert mask.shape == img.shape[:2]
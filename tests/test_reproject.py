@@ -0,0 +1,162 @@
+import numpy as np
+import pytest
+from rasterio.crs import CRS
+from rasterio.transform import from_origin
+from rasterio.warp import Resampling, reproject
+
+from mimosa import parallel
+from mimosa.parallel import set_num_threads
+from mimosa.reproject import (
+    clear_warp_cache,
+    get_target_grid,
+    get_warp_map,
+    reproject_array,
+    reproject_scene,
+)
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    clear_warp_cache()
+    yield
+    clear_warp_cache()
+
+
+@pytest.fixture
+def reference():
+    # Small WGS84 grid over Mandelieu-la-Napoule, like the band TIFFs
+    return {
+        "width": 60,
+        "height": 40,
+        "crs": CRS.from_epsg(4326),
+        "transform": from_origin(6.85, 43.586, 9e-5, 6.5e-5),
+    }
+
+
+def _rasterio_reproject(data, reference, warp_map, resampling):
+    destination = np.zeros(warp_map.shape, dtype=data.dtype)
+    reproject(
+        data,
+        destination,
+        src_transform=reference["transform"],
+        src_crs=reference["crs"],
+        dst_transform=warp_map.profile["transform"],
+        dst_crs=warp_map.profile["crs"],
+        resampling=resampling,
+    )
+    return destination
+
+
+def test_get_target_grid(reference):
+    grid = get_target_grid(reference, "EPSG:3857")
+
+    assert grid["crs"] == CRS.from_epsg(3857)
+    assert grid["width"] > 0
+    assert grid["height"] > 0
+
+
+def test_get_warp_map_cached(reference):
+    warp_map = get_warp_map(reference, "EPSG:3857")
+
+    assert get_warp_map(dict(reference), "EPSG:3857") is warp_map
+    assert get_warp_map(reference, "EPSG:4326") is not warp_map
+    assert not warp_map.nearest.flags.writeable
+
+
+def test_identity_warp(reference):
+    data = np.random.default_rng(42).random((40, 60)).astype(np.float32)
+    warp_map = get_warp_map(reference, "EPSG:4326")
+
+    assert warp_map.shape == (40, 60)
+    assert np.array_equal(reproject_array(data, warp_map), data)
+    assert np.allclose(reproject_array(data, warp_map, "bilinear"), data)
+
+
+def test_reproject_nearest_matches_rasterio(reference):
+    data = np.random.default_rng(42).random((40, 60)).astype(np.float32)
+    warp_map = get_warp_map(reference, "EPSG:3857")
+
+    result = reproject_array(data, warp_map)
+    expected = _rasterio_reproject(data, reference, warp_map, Resampling.nearest)
+
+    assert result.shape == warp_map.shape
+    assert result.dtype == np.float32
+    # Only pixel centers falling on source pixel edges may differ
+    assert np.mean(result == expected) > 0.99
+
+
+def test_reproject_bilinear_smooth(reference):
+    rows, cols = np.mgrid[0:40, 0:60]
+    data = (0.01 * rows + 0.02 * cols).astype(np.float32)
+    warp_map = get_warp_map(reference, "EPSG:3857")
+
+    result = reproject_array(data, warp_map, "bilinear")
+    expected = _rasterio_reproject(data, reference, warp_map, Resampling.bilinear)
+
+    interior = (warp_map.nearest >= 0) & (expected > 0)
+    assert np.allclose(result[interior], expected[interior], atol=0.02)
+
+
+def test_reproject_rgb_image(reference):
+    rgb = np.random.default_rng(42).integers(0, 256, (40, 60, 3), dtype=np.uint8)
+    warp_map = get_warp_map(reference, "EPSG:3857")
+
+    nearest = reproject_array(rgb, warp_map)
+    bilinear = reproject_array(rgb, warp_map, "bilinear")
+
+    assert nearest.shape == (*warp_map.shape, 3)
+    assert bilinear.dtype == np.uint8
+    for channel in range(3):
+        assert np.array_equal(
+            nearest[..., channel], reproject_array(rgb[..., channel], warp_map)
+        )
+
+
+@pytest.mark.parametrize("method", ["nearest", "bilinear"])
+def test_reproject_scene_masks(reference, method):
+    rng = np.random.default_rng(42)
+    bands = {
+        band_id: rng.random((40, 60)).astype(np.float32) for band_id in ("B04", "B08")
+    }
+    masks = {band_id: np.full((40, 60), 255, dtype=np.uint8) for band_id in bands}
+    masks["B04"][10:20, 10:20] = 0
+    warp_map = get_warp_map(reference, "EPSG:3857")
+
+    new_bands, new_masks = reproject_scene(bands, masks, warp_map, method)
+
+    assert list(new_bands) == ["B04", "B08"]
+    outside = warp_map.nearest < 0
+    assert np.all(new_masks["B08"][outside] == 0)
+    assert np.all(new_masks["B08"][~outside] == 255)
+    masked_source = (warp_map.nearest >= 0) & (
+        masks["B04"].ravel()[np.maximum(warp_map.nearest, 0)] == 0
+    )
+    assert np.all(new_masks["B04"][masked_source] == 0)
+    assert np.array_equal(
+        new_bands["B08"], reproject_array(bands["B08"], warp_map, method)
+    )
+
+
+def test_reproject_parallel_matches_serial(reference, monkeypatch):
+    data = np.random.default_rng(42).random((40, 60)).astype(np.float32)
+    warp_map = get_warp_map(reference, "EPSG:3857")
+    serial = reproject_array(data, warp_map, "bilinear")
+
+    monkeypatch.setattr(parallel, "PARALLEL_MIN_PIXELS", 1)
+    monkeypatch.setattr(parallel, "PARALLEL_BLOCK_PIXELS", 256)
+    set_num_threads(2)
+    try:
+        threaded = reproject_array(data, warp_map, "bilinear")
+    finally:
+        set_num_threads(None)
+
+    assert np.array_equal(threaded, serial)
+
+
+def test_reproject_errors(reference):
+    warp_map = get_warp_map(reference, "EPSG:3857")
+
+    with pytest.raises(ValueError, match="Unknown method"):
+        reproject_array(np.zeros((40, 60)), warp_map, "cubic")
+    with pytest.raises(ValueError, match="does not match source grid"):
+        reproject_array(np.zeros((10, 10)), warp_map)
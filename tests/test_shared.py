@@ -0,0 +1,124 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from mimosa.composite import calculate_ndvi, calculate_ndwi
+from mimosa.shared import attach_array, attach_scene, share_array, share_scene
+
+
+@pytest.fixture
+def scene():
+    h, w = 20, 30
+    rng = np.random.default_rng(42)
+    bands = {
+        band_id: rng.random((h, w)).astype(np.float32)
+        for band_id in ("B03", "B04", "B08")
+    }
+    masks = {
+        band_id: np.where(rng.random((h, w)) < 0.1, 0, 255).astype(np.uint8)
+        for band_id in bands
+    }
+    return bands, masks
+
+
+def _index_worker(handle, index_name):
+    func = {"ndvi": calculate_ndvi, "ndwi": calculate_ndwi}[index_name]
+    with attach_scene(handle) as (bands, masks):
+        return func(bands, masks)
+
+
+def _sum_worker(handle):
+    with attach_array(handle) as cube:
+        return float(cube.sum(dtype=np.float64))
+
+
+def test_share_scene_roundtrip(scene):
+    bands, masks = scene
+
+    with share_scene(bands, masks) as handle, attach_scene(handle) as attached:
+        shared_bands, shared_masks = attached
+        assert list(shared_bands) == list(bands)
+        for band_id in bands:
+            assert np.array_equal(shared_bands[band_id], bands[band_id])
+            assert np.array_equal(shared_masks[band_id], masks[band_id])
+            assert not shared_bands[band_id].flags.writeable
+
+
+def test_share_scene_keeps_dtype(scene):
+    bands, masks = scene
+    bands = {band_id: band.astype(np.float64) for band_id, band in bands.items()}
+
+    with share_scene(bands, masks) as handle, attach_scene(handle) as attached:
+        assert handle.bands.dtype == np.dtype(np.float64).str
+        assert np.array_equal(attached[0]["B04"], bands["B04"])
+
+
+def test_share_scene_empty():
+    with pytest.raises(ValueError, match="without bands"), share_scene({}, {}):
+        pass
+
+
+def test_attach_scene_clears_views(scene):
+    with share_scene(*scene) as handle:
+        with attach_scene(handle) as (bands, masks):
+            pass
+        assert bands == {}
+        assert masks == {}
+
+
+def test_attached_view_outlives_context():
+    cube = np.arange(12, dtype=np.float32).reshape(3, 4)
+
+    with share_array(cube) as handle:
+        with attach_array(handle) as shared:
+            row = shared[1]
+        # Mapping is kept open while a view is referenced
+        assert np.array_equal(row, cube[1])
+
+
+def test_share_scene_unlinks_on_exit(scene):
+    with share_scene(*scene) as handle:
+        pass
+
+    with pytest.raises(FileNotFoundError), attach_scene(handle):
+        pass
+
+
+def test_share_array_roundtrip():
+    cube = np.arange(24, dtype=np.float32).reshape(2, 3, 4)
+
+    with share_array(cube) as handle:
+        with attach_array(handle, writable=True) as shared:
+            assert np.array_equal(shared, cube)
+            shared[0, 0, 0] = -1
+        with attach_array(handle) as shared:
+            assert shared[0, 0, 0] == -1
+        # Source array is copied, not shared
+        assert cube[0, 0, 0] == 0
+
+
+def test_share_scene_with_process_pool(scene):
+    bands, masks = scene
+    context = multiprocessing.get_context("spawn")
+
+    with (
+        share_scene(bands, masks) as handle,
+        ProcessPoolExecutor(max_workers=2, mp_context=context) as executor,
+    ):
+        ndvi = executor.submit(_index_worker, handle, "ndvi")
+        ndwi = executor.submit(_index_worker, handle, "ndwi")
+        assert np.array_equal(ndvi.result(), calculate_ndvi(bands, masks))
+        assert np.array_equal(ndwi.result(), calculate_ndwi(bands, masks))
+
+
+def test_share_array_with_process_pool():
+    cube = np.ones((3, 4, 5), dtype=np.float32)
+    context = multiprocessing.get_context("spawn")
+
+    with (
+        share_array(cube) as handle,
+        ProcessPoolExecutor(max_workers=1, mp_context=context) as executor,
+    ):
+        assert executor.submit(_sum_worker, handle).result() == 60.0
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from mimosa.composite import (
+    calculate_moisture_index,
+    calculate_ndvi,
+    create_rgb_composite,
+    normalize_band,
+)
+from mimosa.sparse import compress_scene, expand
+
+
+@pytest.fixture
+def masked_scene():
+    h, w = 40, 50
+    rng = np.random.default_rng(42)
+    bands = {
+        band_id: rng.random((h, w)).astype(np.float32)
+        for band_id in ("B02", "B03", "B04", "B08", "B8A", "B11")
+    }
+    # Large masked area (sea) plus scattered per-band invalid pixels
+    sea = np.zeros((h, w), dtype=bool)
+    sea[:, :30] = True
+    masks = {
+        band_id: np.where(sea | (rng.random((h, w)) < 0.1), 0, 255).astype(np.uint8)
+        for band_id in bands
+    }
+    return bands, masks
+
+
+def test_compress_scene(masked_scene):
+    bands, masks = masked_scene
+
+    flat_bands, flat_masks, index = compress_scene(bands, masks)
+
+    assert index.shape == (40, 50)
+    assert index.packed.nbytes == 40 * 50 // 8
+    assert index.count <= 40 * 20
+    assert not index.footprint[:, :30].any()
+    for band_id in bands:
+        assert flat_bands[band_id].shape == (index.count,)
+        assert np.array_equal(flat_bands[band_id], bands[band_id][index.footprint])
+        assert np.array_equal(flat_masks[band_id], masks[band_id][index.footprint])
+
+
+@pytest.mark.parametrize("func", [calculate_ndvi, calculate_moisture_index])
+def test_sparse_index_matches_dense(masked_scene, func):
+    bands, masks = masked_scene
+    flat_bands, flat_masks, index = compress_scene(bands, masks)
+
+    result = expand(func(flat_bands, flat_masks), index)
+
+    assert result.dtype == np.float32
+    assert np.array_equal(result, func(bands, masks))
+
+
+def test_sparse_normalize_matches_dense(masked_scene):
+    bands, masks = masked_scene
+    flat_bands, flat_masks, index = compress_scene(bands, masks)
+
+    result = expand(normalize_band(flat_bands["B04"], flat_masks["B04"]), index)
+
+    assert np.array_equal(result, normalize_band(bands["B04"], masks["B04"]))
+
+
+def test_sparse_rgb_composite_matches_dense(masked_scene):
+    bands, masks = masked_scene
+    flat_bands, flat_masks, index = compress_scene(bands, masks)
+
+    rgb = create_rgb_composite(flat_bands, flat_masks, "B04", "B03", "B02")
+
+    assert rgb.shape == (index.count, 3)
+    assert np.array_equal(
+        expand(rgb, index),
+        create_rgb_composite(bands, masks, "B04", "B03", "B02"),
+    )
+
+
+def test_expand_fill_and_size_check(masked_scene):
+    *_, index = compress_scene(*masked_scene)
+
+    grid = expand(np.ones(index.count, dtype=np.float32), index, fill=np.nan)
+
+    assert np.isnan(grid[:, :30]).all()
+    assert np.count_nonzero(grid == 1) == index.count
+    with pytest.raises(ValueError, match="Expected"):
+        expand(np.ones(index.count + 1), index)
@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+
+from mimosa.constants import SENTINEL2_BANDS
+from mimosa.spectral import (
+    SPECTRAL_METHODS,
+    SPECTRAL_SIGNATURES,
+    compute_spectral_scores,
+)
+
+
+def _make_scene(h=8, w=10, seed=42):
+    """Random scene whose first pixels are exact copies of each signature."""
+    rng = np.random.default_rng(seed)
+    cube = rng.random((len(SENTINEL2_BANDS), h, w)).astype(np.float32) * 0.4
+    for k, signature in enumerate(SPECTRAL_SIGNATURES.values()):
+        cube[:, 0, k] = signature
+    bands = dict(zip(SENTINEL2_BANDS, cube, strict=True))
+    masks = {band_id: np.full((h, w), 255, dtype=np.uint8) for band_id in bands}
+    return bands, masks
+
+
+def test_spectral_signatures_structure():
+    assert len(SPECTRAL_SIGNATURES) == 5
+    for signature in SPECTRAL_SIGNATURES.values():
+        assert len(signature) == len(SENTINEL2_BANDS)
+
+
+@pytest.mark.parametrize("method", ["spectral_angle", "euclidean"])
+def test_compute_spectral_scores_identifies_signatures(method):
+    bands, masks = _make_scene()
+
+    scores, class_map = compute_spectral_scores(
+        bands, masks, method=method, chunk_pixels=7
+    )
+
+    assert list(scores) == list(SPECTRAL_SIGNATURES)
+    assert class_map.shape == (8, 10)
+    assert class_map.dtype == np.uint8
+    assert np.array_equal(class_map[0, :5], [1, 2, 3, 4, 5])
+    for score in scores.values():
+        assert score.shape == (8, 10)
+        assert score.dtype == np.float32
+
+
+def test_compute_spectral_scores_spectral_angle():
+    bands, masks = _make_scene()
+    scores, _ = compute_spectral_scores(bands, masks)
+
+    pixels = np.stack(list(bands.values())).reshape(len(bands), -1)
+    for name, signature in SPECTRAL_SIGNATURES.items():
+        target = np.array(signature)
+        cosine = (
+            target @ pixels / (np.linalg.norm(target) * np.linalg.norm(pixels, axis=0))
+        )
+        expected = np.arccos(np.clip(cosine, -1, 1)).reshape(8, 10)
+        assert np.allclose(scores[name], expected, atol=1e-3)
+
+
+def test_compute_spectral_scores_euclidean():
+    bands, masks = _make_scene()
+    scores, _ = compute_spectral_scores(bands, masks, method="euclidean")
+
+    pixels = np.stack(list(bands.values())).reshape(len(bands), -1)
+    for name, signature in SPECTRAL_SIGNATURES.items():
+        target = np.array(signature)[:, None]
+        expected = np.linalg.norm(pixels - target, axis=0).reshape(8, 10)
+        assert np.allclose(scores[name], expected, atol=1e-3)
+
+
+def test_compute_spectral_scores_matched_filter_exact_match():
+    bands, masks = _make_scene()
+    scores, _ = compute_spectral_scores(bands, masks, method="matched_filter")
+
+    for k, name in enumerate(SPECTRAL_SIGNATURES):
+        assert scores[name][0, k] == pytest.approx(1.0, abs=1e-3)
+
+
+@pytest.mark.parametrize("method", SPECTRAL_METHODS)
+def test_compute_spectral_scores_shapes(method):
+    bands, masks = _make_scene()
+
+    scores, class_map = compute_spectral_scores(bands, masks, method=method)
+
+    assert class_map.min() >= 1
+    assert class_map.max() <= len(SPECTRAL_SIGNATURES)
+    for score in scores.values():
+        assert score.shape == (8, 10)
+        assert np.isfinite(score).all()
+
+
+def test_compute_spectral_scores_masked_pixels():
+    bands, masks = _make_scene()
+    masks["B11"][2, 3] = 0
+
+    scores, class_map = compute_spectral_scores(bands, masks)
+
+    assert class_map[2, 3] == 0
+    for score in scores.values():
+        assert score[2, 3] == 0.0
+
+
+def test_compute_spectral_scores_invalid_arguments():
+    bands, masks = _make_scene()
+    with pytest.raises(ValueError, match="Unknown spectral method"):
+        compute_spectral_scores(bands, masks, method="cosine")
+    with pytest.raises(ValueError, match="expected 12"):
+        compute_spectral_scores(bands, masks, signatures={"Bad": (0.1, 0.2)})
+    with pytest.raises(ValueError, match="got 0"):
+        compute_spectral_scores(bands, masks, signatures={})
+    many = {f"Class {i}": (0.1,) * 12 for i in range(256)}
+    with pytest.raises(ValueError, match="got 256"):
+        compute_spectral_scores(bands, masks, signatures=many)
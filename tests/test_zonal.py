@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+from rasterio.crs import CRS
+from rasterio.transform import from_origin
+
+from mimosa.zonal import clear_zone_cache, compute_zonal_stats, rasterize_zones
+
+
+@pytest.fixture
+def zones_scene():
+    h, w = 30, 40
+    rng = np.random.default_rng(42)
+    labels = rng.integers(0, 5, (h, w)).astype(np.int32)
+    values = rng.random((3, h, w)).astype(np.float32)
+    mask = np.where(rng.random((3, h, w)) < 0.2, 0, 255).astype(np.uint8)
+    return labels, values, mask
+
+
+def _loop_reference(values, labels, mask, zone):
+    return values[(labels == zone + 1) & (mask == 255)]
+
+
+def test_compute_zonal_stats_matches_loop(zones_scene):
+    labels, values, mask = zones_scene
+    bins = np.linspace(0, 1, 6)
+
+    stats = compute_zonal_stats(values, labels, mask=mask, n_zones=5, bins=bins)
+
+    assert stats["count"].shape == (3, 5)
+    assert stats["histogram"].shape == (3, 5, 5)
+    for t in range(3):
+        for zone in range(4):
+            selected = _loop_reference(values[t], labels, mask[t], zone)
+            assert stats["count"][t, zone] == selected.size
+            assert stats["sum"][t, zone] == pytest.approx(
+                selected.sum(dtype=np.float64)
+            )
+            assert stats["mean"][t, zone] == pytest.approx(selected.mean())
+            assert stats["min"][t, zone] == selected.min()
+            assert stats["max"][t, zone] == selected.max()
+            expected_hist, _ = np.histogram(selected, bins=bins)
+            assert np.array_equal(stats["histogram"][t, zone], expected_hist)
+    # Label 5 is never drawn by integers(0, 5)
+    assert stats["count"][0, 4] == 0
+    assert np.isnan(stats["mean"][0, 4])
+    assert np.isnan(stats["min"][0, 4])
+
+
+def test_compute_zonal_stats_single_date(zones_scene):
+    labels, values, _ = zones_scene
+
+    stats = compute_zonal_stats(values[0], labels)
+
+    assert stats["count"].shape == (4,)
+    assert stats["count"].sum() == np.count_nonzero(labels)
+    assert stats["max"][1] == values[0][labels == 2].max()
+
+
+def test_compute_zonal_stats_shared_mask(zones_scene):
+    labels, values, mask = zones_scene
+
+    stats = compute_zonal_stats(values, labels, mask=mask[0])
+
+    for t in range(3):
+        selected = _loop_reference(values[t], labels, mask[0], 0)
+        assert stats["count"][t, 0] == selected.size
+
+
+def test_compute_zonal_stats_no_zones():
+    stats = compute_zonal_stats(np.ones((4, 4)), np.zeros((4, 4), dtype=np.int32))
+
+    assert stats["count"].shape == (0,)
+
+
+def test_compute_zonal_stats_shape_mismatch(zones_scene):
+    labels, values, mask = zones_scene
+
+    with pytest.raises(ValueError, match="Values shape"):
+        compute_zonal_stats(values[:, :10], labels)
+    with pytest.raises(ValueError, match="Mask shape"):
+        compute_zonal_stats(values, labels, mask=mask[:2])
+    with pytest.raises(ValueError, match="Mask shape"):
+        compute_zonal_stats(values[0], labels, mask=mask[:, :10])
+
+
+def test_rasterize_zones():
+    clear_zone_cache()
+    reference = {
+        "width": 10,
+        "height": 10,
+        "crs": CRS.from_epsg(32632),
+        "transform": from_origin(0, 100, 10, 10),
+    }
+    zones = [
+        {"type": "Polygon", "coordinates": [[(0, 100), (50, 100), (50, 50), (0, 50)]]},
+        {"type": "Polygon", "coordinates": [[(50, 50), (100, 50), (100, 0), (50, 0)]]},
+    ]
+
+    labels = rasterize_zones(zones, reference)
+
+    assert labels.shape == (10, 10)
+    assert labels.dtype == np.int32
+    assert np.all(labels[:5, :5] == 1)
+    assert np.all(labels[5:, 5:] == 2)
+    assert np.all(labels[:5, 5:] == 0)
+    assert not labels.flags.writeable
+    # Same zones and grid hit the cache
+    assert rasterize_zones(zones, reference) is labels